@@ -0,0 +1,127 @@
+"""
+RealmAgents address label registry
+- Loads address labels from CSV (address,label) or JSONL ({"address","label"})
+- Emits the small built-in KNOWN table inlined into worker.js
+- Compiles large registries into a compact binary (RLB1) that the worker loads
+  lazily from KV and refreshes without a redeploy
+
+RLB1 layout (little-endian):
+  header   magic "RLB1", flags u32, count u32, labelCount u32, stringBytes u32
+  buckets  257 x u32   first index of each leading address byte (prefix buckets)
+  addrs    count x 20  raw addresses, sorted
+  ids      count x u16 (flags & 1) or u32   index into the label table
+  offsets  (labelCount + 1) x u32           byte offsets into the string blob
+  strings  stringBytes                      UTF-8 labels, deduplicated
+
+Usage:
+  python3 address_labels.py compile labels.csv [more.jsonl ...] -o labels.bin
+  python3 address_labels.py synth 100000 labels-100k.csv
+"""
+import csv, hashlib, json, os, random, re, struct, sys
+
+MAGIC = b"RLB1"
+HEADER = struct.Struct("<4sIIII")
+FLAG_U16_IDS = 1
+ADDRESS_RE = re.compile(r"^0x[0-9a-f]{40}$")
+
+
+def load_labels(*paths):
+    """Read label files in order; later files override earlier ones."""
+    labels = {}
+    for path in paths:
+        with open(path, newline="") as f:
+            if path.endswith(".jsonl"):
+                rows = (json.loads(line) for line in f if line.strip())
+            else:
+                rows = csv.DictReader(f)
+            for row in rows:
+                addr = (row.get("address") or "").strip().lower()
+                name = (row.get("label") or "").strip()
+                if not ADDRESS_RE.match(addr) or not name:
+                    print(f"[WARN] {os.path.basename(path)}: skipping bad row {row!r}")
+                    continue
+                labels[addr] = name
+    return labels
+
+
+def to_js_object(labels):
+    """Render labels as the KNOWN object literal used by the worker."""
+    rows = [f"  {json.dumps(a)}: {json.dumps(l)}," for a, l in labels.items()]
+    return "{\n" + "\n".join(rows) + "\n}"
+
+
+def compile_labels(labels):
+    """Pack labels into an RLB1 blob."""
+    addrs = sorted(labels)
+    names = sorted(set(labels.values()))
+    name_id = {n: i for i, n in enumerate(names)}
+    encoded = [n.encode() for n in names]
+
+    buckets = [0] * 257
+    for a in addrs:
+        buckets[int(a[2:4], 16) + 1] += 1
+    for i in range(256):
+        buckets[i + 1] += buckets[i]
+
+    u16 = len(names) <= 0xFFFF
+    offsets, pos = [], 0
+    for e in encoded:
+        offsets.append(pos)
+        pos += len(e)
+    offsets.append(pos)
+
+    return b"".join([
+        HEADER.pack(MAGIC, FLAG_U16_IDS if u16 else 0, len(addrs), len(names), pos),
+        struct.pack(f"<{len(buckets)}I", *buckets),
+        b"".join(bytes.fromhex(a[2:]) for a in addrs),
+        struct.pack(f"<{len(addrs)}{'H' if u16 else 'I'}", *(name_id[labels[a]] for a in addrs)),
+        struct.pack(f"<{len(offsets)}I", *offsets),
+        b"".join(encoded),
+    ])
+
+
+def etag(blob):
+    return hashlib.sha1(blob).hexdigest()[:16]
+
+
+def synth_labels(n, seed=7):
+    """Synthetic registry: n random addresses over a few thousand entity labels."""
+    rnd = random.Random(seed)
+    entities = ["Binance", "Coinbase", "Kraken", "KuCoin", "Gate.io", "Uniswap", "Aerodrome", "Fund", "Whale", "Bridge"]
+    return {
+        "0x" + rnd.randbytes(20).hex(): f"{rnd.choice(entities)} {rnd.randint(1, 400)}"
+        for _ in range(n)
+    }
+
+
+def main(argv):
+    if len(argv) >= 2 and argv[0] == "compile":
+        out = "labels.bin"
+        if "-o" in argv:
+            i = argv.index("-o")
+            out = argv[i + 1]
+            argv = argv[:i] + argv[i + 2:]
+        labels = load_labels(*argv[1:])
+        blob = compile_labels(labels)
+        with open(out, "wb") as f:
+            f.write(blob)
+        tag = etag(blob)
+        print(f"[OK] Compiled {len(labels)} labels -> {out} ({len(blob)} bytes, etag {tag})")
+        print("Publish (no redeploy needed):")
+        print(f"  npx wrangler kv key put labels:bin --path {out} --binding AGENT_KV")
+        print(f"  npx wrangler kv key put labels:etag {tag} --binding AGENT_KV")
+    elif len(argv) == 3 and argv[0] == "synth":
+        labels = synth_labels(int(argv[1]))
+        with open(argv[2], "w", newline="") as f:
+            w = csv.writer(f, lineterminator="\n")
+            w.writerow(["address", "label"])
+            w.writerows(labels.items())
+        print(f"[OK] Wrote {len(labels)} synthetic labels -> {argv[2]}")
+    else:
+        print(__doc__.strip())
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -111,14 +111,43 @@ function getRpcUrl(env) {
   return BASE_RPC;
 }
 
-async function rpcCall(method, params, rpcUrl) {
-  const res = await fetch(rpcUrl || BASE_RPC, {
-    method: "POST",
-    headers: { "Content-Type": "application/json" },
-    body: JSON.stringify({ jsonrpc: "2.0", method, params, id: 1 }),
+// Calls issued in the same tick against the same endpoint are collected and
+// sent as one JSON-RPC batch POST; responses are matched back by id.
+const RPC_BATCH_MAX = 50;
+const rpcQueues = new Map();
+let rpcSeq = 0;
+
+function rpcCall(method, params, rpcUrl) {
+  const url = rpcUrl || BASE_RPC;
+  return new Promise((resolve, reject) => {
+    let queue = rpcQueues.get(url);
+    if (!queue) {
+      queue = [];
+      rpcQueues.set(url, queue);
+      queueMicrotask(() => flushRpcQueue(url));
+    }
+    queue.push({ id: ++rpcSeq, method, params, resolve, reject });
   });
-  const data = await res.json();
-  return data.result;
+}
+
+async function flushRpcQueue(url) {
+  const queue = rpcQueues.get(url);
+  rpcQueues.delete(url);
+  for (let i = 0; i < queue.length; i += RPC_BATCH_MAX) {
+    const calls = queue.slice(i, i + RPC_BATCH_MAX);
+    try {
+      const res = await fetch(url, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify(calls.map(c => ({ jsonrpc: "2.0", method: c.method, params: c.params, id: c.id }))),
+      });
+      const data = await res.json();
+      const byId = new Map((Array.isArray(data) ? data : [data]).map(r => [r?.id, r]));
+      for (const c of calls) c.resolve(byId.get(c.id)?.result);
+    } catch (e) {
+      for (const c of calls) c.reject(e);
+    }
+  }
 }
 
 async function ethCall(to, data, rpcUrl) {
@@ -129,6 +158,40 @@ function pad32(hex) {
   return hex.replace("0x", "").padStart(64, "0");
 }
 
+// ─── Shared Price Snapshots ─────────────────────────────────
+
+// Each upstream price set is fetched at most once per PRICE_TTL_MS and shared
+// by every fetcher that reads it: swap gets REALM and WETH from one DeFiLlama
+// call. Concurrent requests await the same in-flight promise; a failed fetch
+// is dropped immediately so the next caller retries. Only small price
+// payloads belong here: the yields.llama.fi/pools list is tens of MB and stays
+// a per-fetcher request, so it is never held by the isolate.
+const PRICE_TTL_MS = 60 * 1000;
+const priceSets = new Map();
+
+async function fetchJson(url) {
+  const res = await fetch(url);
+  if (!res.ok) throw new Error(`${new URL(url).host}: HTTP ${res.status}`);
+  return res.json();
+}
+
+const PRICE_SOURCES = {
+  baseTokens: () => fetchJson(`https://coins.llama.fi/prices/current/base:${REALM_TOKEN},base:${WETH}`),
+  geckoMarkets: () => fetchJson("https://api.coingecko.com/api/v3/coins/markets?vs_currency=usd&order=market_cap_desc&per_page=10&page=1&sparkline=true&price_change_percentage=1h,24h,7d"),
+  geckoGlobal: () => fetchJson("https://api.coingecko.com/api/v3/global"),
+};
+
+function priceSet(name) {
+  const entry = priceSets.get(name);
+  if (entry && Date.now() - entry.at < PRICE_TTL_MS) return entry.promise;
+  const promise = PRICE_SOURCES[name]();
+  priceSets.set(name, { at: Date.now(), promise });
+  promise.catch(() => {
+    if (priceSets.get(name)?.promise === promise) priceSets.delete(name);
+  });
+  return promise;
+}
+
 // ─── Original Agent Data Fetchers (v1) ──────────────────────
 
 async function fetchYieldData() {
@@ -166,12 +229,7 @@ async function fetchYieldData() {
 
 async function fetchSentimentData() {
   try {
-    const [marketRes, globalRes] = await Promise.all([
-      fetch("https://api.coingecko.com/api/v3/coins/markets?vs_currency=usd&order=market_cap_desc&per_page=10&page=1&sparkline=true&price_change_percentage=1h,24h,7d"),
-      fetch("https://api.coingecko.com/api/v3/global")
-    ]);
-    const marketData = await marketRes.json();
-    const globalData = await globalRes.json();
+    const [marketData, globalData] = await Promise.all([priceSet("geckoMarkets"), priceSet("geckoGlobal")]);
     const priceChanges = marketData.map(c => c.price_change_percentage_24h || 0);
     const avgChange = priceChanges.reduce((s, v) => s + v, 0) / priceChanges.length;
     const positiveCount = priceChanges.filter(c => c > 0).length;
@@ -250,16 +308,11 @@ async function fetchWhaleData(env) {
 async function fetchSwapData(env) {
   try {
     const rpcUrl = getRpcUrl(env);
-    // Get REALM price from DeFiLlama
-    const priceRes = await fetch(`https://coins.llama.fi/prices/current/base:${REALM_TOKEN}`);
-    const priceData = await priceRes.json();
+    // REALM and WETH prices from DeFiLlama (one shared request)
+    const priceData = await priceSet("baseTokens");
     const realmCoin = priceData.coins?.[`base:${REALM_TOKEN}`] || {};
     const realmPrice = realmCoin.price || 0;
-
-    // Get WETH price
-    const wethRes = await fetch(`https://coins.llama.fi/prices/current/base:${WETH}`);
-    const wethData = await wethRes.json();
-    const wethPrice = wethData.coins?.[`base:${WETH}`]?.price || 0;
+    const wethPrice = priceData.coins?.[`base:${WETH}`]?.price || 0;
 
     // Simple signal based on 24h confidence
     const confidence = realmCoin.confidence || 0;
@@ -314,20 +367,17 @@ async function fetchRebalancerData(env) {
 async function fetchGovernanceData(env) {
   try {
     const rpcUrl = getRpcUrl(env);
-    // Read DAO treasury (REALM balanceOf DAO)
-    const treasuryHex = await ethCall(REALM_TOKEN, SEL.balanceOf + pad32(REALM_DAO), rpcUrl);
+    // DAO treasury (REALM balanceOf DAO), total supply, proposal count and
+    // total staked — issued together so they share one batched RPC round trip
+    const [treasuryHex, supplyHex, countHex, stakedHex] = await Promise.all([
+      ethCall(REALM_TOKEN, SEL.balanceOf + pad32(REALM_DAO), rpcUrl),
+      ethCall(REALM_TOKEN, SEL.totalSupply, rpcUrl),
+      ethCall(REALM_DAO, SEL.proposalCount, rpcUrl),
+      ethCall(REALM_DAO, SEL.totalStaked, rpcUrl),
+    ]);
     const treasury = Number(BigInt(treasuryHex || "0x0") / (10n ** 18n));
-
-    // Read total supply
-    const supplyHex = await ethCall(REALM_TOKEN, SEL.totalSupply, rpcUrl);
     const totalSupply = Number(BigInt(supplyHex || "0x0") / (10n ** 18n));
-
-    // Read proposal count
-    const countHex = await ethCall(REALM_DAO, SEL.proposalCount, rpcUrl);
     const proposalCount = Number(BigInt(countHex || "0x0"));
-
-    // Read total staked
-    const stakedHex = await ethCall(REALM_DAO, SEL.totalStaked, rpcUrl);
     const totalStaked = Number(BigInt(stakedHex || "0x0") / (10n ** 18n));
 
     return {
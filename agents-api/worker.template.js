@@ -0,0 +1,1332 @@
+/**
+ * RealmAgents API Worker v2.1
+ * Multi-source: DeFiLlama, Alternative.me Fear&Greed, CoinGecko fallback, Alchemy RPC
+ */
+
+const CORS_HEADERS = {
+  "Access-Control-Allow-Origin": "*",
+  "Access-Control-Allow-Methods": "GET, OPTIONS",
+  "Access-Control-Allow-Headers": "Content-Type",
+  "Access-Control-Expose-Headers": "X-Cache, X-Cache-Age, X-Cache-Hit-Ratio",
+  "Content-Type": "application/json",
+};
+
+// ─── Known Address Labels ─────────────────────────
+// Built-in seed, generated from agents-api/labels.csv
+const KNOWN = __KNOWN_LABELS__;
+
+// Precomputed once per isolate: lowercase address -> { label, isExchange, entity }.
+// Exchange classification of labels that only show up at runtime (Nansen) is
+// memoized so the regex runs at most once per distinct label.
+const EXCHANGE_RE = /Binance|Coinbase|Gate|Kraken|KuCoin/i;
+const ADDRESS_INDEX = new Map(Object.entries(KNOWN).map(([a, l]) => {
+  const ex = l.match(EXCHANGE_RE);
+  return [a, { label:l, isExchange:!!ex, entity: ex ? ex[0] : l.replace(/\s+\d+$/, "") }];
+}));
+const LABEL_IS_EXCHANGE = new Map([...ADDRESS_INDEX.values()].map(i => [i.label, i.isExchange]));
+// Log topics are already lowercase hex, so the hot path skips toLowerCase()
+const labelLc = (a) => ADDRESS_INDEX.get(a)?.label || registryLabel(a);
+const label = (a) => labelLc(a.toLowerCase());
+// Large registry: RLB1 blob compiled by address_labels.py and published to KV
+// (labels:bin + labels:etag). Loaded lazily and re-checked every
+// LABELS_REFRESH_S, so label updates need no redeploy.
+const LABELS_REFRESH_S = 300;
+let labelRegistry = null, labelsCheckedAt = 0, labelsEtag = null;
+
+function parseLabelRegistry(buf) {
+  const dv = new DataView(buf), u8 = new Uint8Array(buf);
+  if (String.fromCharCode(...u8.subarray(0, 4)) !== "RLB1") return null;
+  const flags = dv.getUint32(4, true), count = dv.getUint32(8, true), nLabels = dv.getUint32(12, true);
+  const buckets = new Uint32Array(buf.slice(20, 20 + 257 * 4));
+  const addrs = 20 + 257 * 4, ids = addrs + count * 20, idSize = flags & 1 ? 2 : 4;
+  const offs = ids + count * idSize, strs = offs + (nLabels + 1) * 4;
+  return { dv, u8, count, buckets, addrs, ids, idSize, offs, strs, names:new Array(nLabels), dec:new TextDecoder() };
+}
+
+async function loadLabelRegistry(env) {
+  if (!env.AGENT_KV || Date.now() - labelsCheckedAt < LABELS_REFRESH_S * 1000) return;
+  labelsCheckedAt = Date.now();
+  try {
+    const tag = await env.AGENT_KV.get("labels:etag");
+    if (!tag || tag === labelsEtag) return;
+    const buf = await env.AGENT_KV.get("labels:bin", "arrayBuffer");
+    const reg = buf && parseLabelRegistry(buf);
+    if (reg) { labelRegistry = reg; labelsEtag = tag; }
+  } catch(e) {}
+}
+
+const LABEL_KEY = new Uint8Array(20);
+const hexNibble = (c) => c <= 57 ? c - 48 : (c | 32) - 87;
+
+// Binary search inside the bucket of the address's first byte
+function registryLabel(a) {
+  const R = labelRegistry;
+  if (!R || a.length !== 42) return null;
+  const key = LABEL_KEY;
+  for (let i = 0; i < 20; i++) key[i] = hexNibble(a.charCodeAt(2 + i * 2)) << 4 | hexNibble(a.charCodeAt(3 + i * 2));
+  let lo = R.buckets[key[0]], hi = R.buckets[key[0] + 1] - 1;
+  while (lo <= hi) {
+    const mid = (lo + hi) >>> 1, base = R.addrs + mid * 20;
+    let c = 0;
+    for (let i = 1; i < 20 && !c; i++) c = R.u8[base + i] - key[i];
+    if (!c) {
+      const id = R.idSize === 2 ? R.dv.getUint16(R.ids + mid * 2, true) : R.dv.getUint32(R.ids + mid * 4, true);
+      if (R.names[id] === undefined) {
+        const s = R.dv.getUint32(R.offs + id * 4, true), e = R.dv.getUint32(R.offs + id * 4 + 4, true);
+        R.names[id] = R.dec.decode(R.u8.subarray(R.strs + s, R.strs + e));
+      }
+      return R.names[id];
+    }
+    if (c < 0) lo = mid + 1; else hi = mid - 1;
+  }
+  return null;
+}
+
+function isExchangeLabel(l) {
+  if (!l) return false;
+  let ex = LABEL_IS_EXCHANGE.get(l);
+  if (ex === undefined) { ex = EXCHANGE_RE.test(l); LABEL_IS_EXCHANGE.set(l, ex); }
+  return ex;
+}
+
+// ─── Whale Summary ────────────────────────────────
+// Summary statistics over labeled transfer rows in a single pass
+function whaleSummary(rows, symbols) {
+  let labeled = 0, exFlows = 0, toEx = 0, fromEx = 0;
+  const wallets = new Set();
+  const byAsset = Object.fromEntries(symbols.map(s => [s, { transfers:0, volume:0 }]));
+  for (const t of rows) {
+    const s = byAsset[t.asset];
+    if (s) { s.transfers++; s.volume += t.amount; }
+    wallets.add(t.from); wallets.add(t.to);
+    if (t.fromLabel || t.toLabel) labeled++;
+    const fx = isExchangeLabel(t.fromLabel), tx = isExchangeLabel(t.toLabel);
+    if (fx || tx) exFlows++;
+    if (tx) toEx++;
+    if (fx) fromEx++;
+  }
+  for (const s of Object.values(byAsset)) s.volume = Math.round(s.volume*10000)/10000;
+  return { byAsset, uniq:wallets.size, labeled, exFlows, toEx, fromEx };
+}
+
+// ─── Metadata ─────────────────────────────────────
+const AGENTS = [
+  { name:"Yield Optimizer", description:"Monitors DeFi yields on Base L2 with risk scoring, APY trends, and stablecoin filters.", image:"https://realmagents.io/agents/yield-optimizer.svg", category:"DEFI", version:"__VERSION__", chain:"base", status:"active" },
+  { name:"Sentiment Analyzer", description:"Multi-source market sentiment combining Fear & Greed Index, price momentum, and market breadth.", image:"https://realmagents.io/agents/sentiment-analyzer.svg", category:"ANALYTICS", version:"__VERSION__", chain:"base", status:"active" },
+  { name:"Whale Tracker", description:"Tracks REALM and WETH transfers on Base with address labeling and exchange flow detection.", image:"https://realmagents.io/agents/whale-tracker.svg", category:"ANALYTICS", version:"__VERSION__", chain:"base", status:"active" },
+  { name:"Launchpad Indexer", description:"Indexes AgentLaunchpad launches and trades into per-agent OHLC candles and volume.", image:"https://realmagents.io/agents/launchpad-indexer.svg", category:"ANALYTICS", version:"__VERSION__", chain:"base", status:"active" },
+];
+
+// ─── Upstream Client ──────────────────────────────
+// safeFetch keeps state per upstream host:
+// - circuit breaker: BREAKER_FAILS consecutive failures (network error,
+//   timeout, 429, 5xx) open it; while open, calls throw at once so callers
+//   fall back in milliseconds. After the cooldown a single probe goes through
+//   (half-open); a failed probe doubles the cooldown up to BREAKER_MAX_S.
+//   A 429's Retry-After sets the cooldown directly.
+// - latency histogram of successful responses (log-spaced buckets, halved
+//   once HIST_MAX samples accumulate so it tracks recent behaviour)
+// - hedging: a GET still unanswered after the host's HEDGE_QUANTILE latency
+//   gets a second identical request; the first response wins and the other
+//   is aborted. ms is the deadline for the call as a whole, body included;
+//   opts.signal cancels it (a cancelled call is not counted as a failure).
+const BREAKER_FAILS = 3, BREAKER_OPEN_S = 30, BREAKER_MAX_S = 300;
+const HEDGE_QUANTILE = 0.95, HEDGE_MIN_MS = 100, HEDGE_MIN_SAMPLES = 20;
+const LATENCY_BOUNDS = [25, 50, 100, 200, 400, 800, 1600, 3200, 6400]; // ms; last bucket is open-ended
+const HIST_MAX = 2000;
+const UPSTREAMS = new Map();
+
+function upstream(host) {
+  let u = UPSTREAMS.get(host);
+  if (!u) {
+    u = { hist:new Array(LATENCY_BOUNDS.length + 1).fill(0), samples:0, fails:0, openUntil:0, cooldown:BREAKER_OPEN_S,
+      probing:false, requests:0, failures:0, shortCircuits:0, hedges:0, hedgeWins:0 };
+    UPSTREAMS.set(host, u);
+  }
+  return u;
+}
+
+// Upper bound of the bucket holding quantile q (Infinity past the last bound)
+function latencyQuantile(u, q) {
+  if (!u.samples) return null;
+  let seen = 0;
+  for (let i = 0; i < u.hist.length; i++) { seen += u.hist[i]; if (seen >= q * u.samples) return LATENCY_BOUNDS[i] ?? Infinity; }
+  return Infinity;
+}
+
+function recordLatency(u, ms) {
+  const i = LATENCY_BOUNDS.findIndex(b => ms <= b);
+  u.hist[i < 0 ? LATENCY_BOUNDS.length : i]++;
+  if (++u.samples >= HIST_MAX) { u.hist = u.hist.map(n => n >> 1); u.samples = u.hist.reduce((a, b) => a + b, 0); }
+}
+
+function recordFailure(u, retryAfterS) {
+  u.failures++;
+  if (u.probing) u.cooldown = Math.min(BREAKER_MAX_S, u.cooldown * 2);
+  if (++u.fails >= BREAKER_FAILS || retryAfterS) u.openUntil = Date.now() + Math.min(BREAKER_MAX_S, retryAfterS || u.cooldown) * 1000;
+}
+
+function breakerState(u) {
+  return Date.now() < u.openUntil ? "open" : u.fails >= BREAKER_FAILS ? "half-open" : "closed";
+}
+
+async function safeFetch(url, opts = {}, ms = 8000) {
+  const host = new URL(url).host, u = upstream(host);
+  u.requests++;
+  const state = breakerState(u);
+  if (state === "open" || (state === "half-open" && u.probing)) { u.shortCircuits++; throw new Error(`${host}: circuit open`); }
+  if (state === "half-open") u.probing = true;
+
+  const idempotent = !opts.method || opts.method === "GET";
+  const hedgeAt = idempotent && u.samples >= HEDGE_MIN_SAMPLES ? Math.max(HEDGE_MIN_MS, latencyQuantile(u, HEDGE_QUANTILE)) : Infinity;
+  const attempts = [], abortAll = () => { for (const c of attempts) c.abort(); };
+  let hedgeTimer, fail, reading = false;
+  // The deadline and the caller's abort listener stay armed until the body has
+  // been read, cancelled or has failed, so a body that stalls mid-stream is
+  // cut off at ms and counted against the host.
+  const release = () => { clearTimeout(deadline); opts.signal?.removeEventListener("abort", onAbort); };
+  function onAbort() { abortAll(); release(); fail?.(new Error(`${host}: cancelled`)); }
+  const deadline = setTimeout(() => {
+    abortAll(); release();
+    if (reading) recordFailure(u, 0);
+    fail?.(new Error(`${host}: timeout after ${ms}ms`));
+  }, ms);
+  opts.signal?.addEventListener("abort", onAbort, { once:true });
+  try {
+    const win = await new Promise((resolve, reject) => {
+      let pending = 0;
+      fail = reject;
+      const launch = (hedged) => {
+        const c = new AbortController(), t0 = Date.now();
+        attempts.push(c); pending++;
+        fetch(url, { ...opts, signal:c.signal }).then(
+          r => resolve({ r, c, hedged, took:Date.now() - t0 }),
+          e => { if (--pending === 0) reject(e); });
+      };
+      launch(false);
+      if (hedgeAt < ms) hedgeTimer = setTimeout(() => { u.hedges++; launch(true); }, hedgeAt);
+    });
+    for (const c of attempts) if (c !== win.c) c.abort();
+    if (win.hedged) u.hedgeWins++;
+    if (win.r.status === 429 || win.r.status >= 500) {
+      recordFailure(u, win.r.status === 429 ? parseInt(win.r.headers.get("Retry-After")) || 0 : 0);
+    } else {
+      u.fails = 0; u.cooldown = BREAKER_OPEN_S; u.openUntil = 0;
+      recordLatency(u, win.took);
+    }
+    if (!win.r.body) { release(); return win.r; }
+    const reader = win.r.body.getReader();
+    const body = new ReadableStream({
+      async pull(ctl) {
+        reading = true;
+        try {
+          const { done, value } = await reader.read();
+          if (done) { release(); ctl.close(); } else ctl.enqueue(value);
+        } catch(e) { release(); ctl.error(e); }
+      },
+      cancel(reason) { release(); return reader.cancel(reason); },
+    }, { highWaterMark:0 }); // no read-ahead: an unread body is not "reading"
+    return new Response(body, { status:win.r.status, statusText:win.r.statusText, headers:win.r.headers });
+  } catch(e) {
+    release();
+    if (!opts.signal?.aborted) recordFailure(u, 0);
+    throw e;
+  } finally {
+    clearTimeout(hedgeTimer);
+    if (state === "half-open") u.probing = false;
+  }
+}
+
+function upstreamStats() {
+  return Object.fromEntries([...UPSTREAMS].map(([host, u]) => [host, {
+    state:breakerState(u), consecutiveFailures:u.fails, requests:u.requests, failures:u.failures,
+    shortCircuits:u.shortCircuits, hedges:u.hedges, hedgeWins:u.hedgeWins, samples:u.samples,
+    p50:latencyQuantile(u, 0.5), p95:latencyQuantile(u, 0.95), p99:latencyQuantile(u, 0.99),
+    histogram:Object.fromEntries(u.hist.map((n, i) => [i < LATENCY_BOUNDS.length ? `<=${LATENCY_BOUNDS[i]}` : `>${LATENCY_BOUNDS.at(-1)}`, n])),
+  }]));
+}
+
+// ─── Multi-source Resolver ────────────────────────
+// resolveFirst starts every source at once and settles on the highest-priority
+// (earliest listed) valid result. A valid result is returned as soon as every
+// source ahead of it has failed; otherwise the sources ahead get up to `wait`
+// ms more. At the `ms` deadline the best valid result so far wins (null if
+// none). Losers are cancelled through the AbortSignal handed to run(); sources
+// reading a shared priceSet() just have their result ignored. Worst-case
+// latency is the deadline, not the sum of each source's timeout.
+// sources: [{ name, run(signal) -> value|null, valid?(value) }]
+function resolveFirst(sources, { ms = 8000, wait = ms } = {}) {
+  const ctrl = new AbortController(), t0 = Date.now();
+  const results = new Array(sources.length).fill(undefined); // undefined: pending, null: failed/invalid, { value }: valid
+  return new Promise(resolve => {
+    let done = false, waitTimer;
+    const deadline = setTimeout(() => settle(true), ms);
+    function settle(force) {
+      if (done) return;
+      const best = results.findIndex(r => r);
+      if (!force && results.slice(0, best < 0 ? sources.length : best).some(r => r === undefined)) {
+        if (best >= 0 && !waitTimer) waitTimer = setTimeout(() => settle(true), wait);
+        return;
+      }
+      done = true; clearTimeout(deadline); clearTimeout(waitTimer); ctrl.abort();
+      resolve(best < 0 ? null : { source:sources[best].name, value:results[best].value, ms:Date.now() - t0 });
+    }
+    sources.forEach((src, i) => {
+      Promise.resolve().then(() => src.run(ctrl.signal)).then(
+        v => { results[i] = v != null && (!src.valid || src.valid(v)) ? { value:v } : null; settle(false); },
+        () => { results[i] = null; settle(false); });
+    });
+  });
+}
+
+// ─── Price Snapshots ──────────────────────────────
+// Each upstream price set is fetched at most once per PRICE_TTL_S and shared
+// by every consumer: fetchers running in the same handler and concurrent
+// requests all await the same promise. A failed fetch (network error or
+// non-2xx, e.g. a CoinGecko 429) is dropped at once so the next caller retries.
+const PRICE_TTL_S = 60;
+const PRICE_SETS = new Map();
+const LLAMA_COINS = {"coingecko:bitcoin":"BTC","coingecko:ethereum":"ETH","coingecko:solana":"SOL","coingecko:binancecoin":"BNB","coingecko:ripple":"XRP","coingecko:cardano":"ADA","coingecko:avalanche-2":"AVAX","coingecko:chainlink":"LINK","coingecko:polkadot":"DOT","coingecko:dogecoin":"DOGE"};
+const LLAMA_IDS = Object.keys(LLAMA_COINS).join(",");
+
+async function fetchJson(url, ms) {
+  const r = await safeFetch(url, {}, ms);
+  if (!r.ok) throw new Error(`${new URL(url).host}: HTTP ${r.status}`);
+  return r.json();
+}
+
+const PRICE_SOURCES = {
+  llamaPrices: () => fetchJson(`https://coins.llama.fi/prices/current/${LLAMA_IDS}`),
+  llamaChanges: () => fetchJson(`https://coins.llama.fi/percentage/${LLAMA_IDS}?period=1d`),
+  geckoMarkets: () => fetchJson("https://api.coingecko.com/api/v3/coins/markets?vs_currency=usd&order=market_cap_desc&per_page=10&page=1&price_change_percentage=24h,7d", 6000),
+  geckoGlobal: () => fetchJson("https://api.coingecko.com/api/v3/global", 6000),
+};
+
+function priceSet(name) {
+  const e = PRICE_SETS.get(name);
+  if (e && Date.now() - e.at < PRICE_TTL_S * 1000) return e.p;
+  const p = PRICE_SOURCES[name]();
+  PRICE_SETS.set(name, { at:Date.now(), p });
+  p.catch(() => { if (PRICE_SETS.get(name)?.p === p) PRICE_SETS.delete(name); });
+  return p;
+}
+
+// ─── Batched JSON-RPC ──────────────────────────────
+// Calls issued in the same tick against the same endpoint go out as a single
+// JSON-RPC batch POST and are resolved by id. Each call resolves to its raw
+// response object ({result} or {error}). If the provider rejects the batch as
+// a whole as too large (413 or a "response size" error), the calls are retried
+// one by one; any other error reply is handed to every call in the batch.
+const RPC_BATCH_MAX = 50;
+const RPC_TOO_LARGE = /response size|too large|size exceeded/i;
+const RPC_QUEUES = new Map();
+let rpcSeq = 0;
+
+function rpc(url, method, params = []) {
+  return new Promise((resolve, reject) => {
+    let q = RPC_QUEUES.get(url);
+    if (!q) { q = []; RPC_QUEUES.set(url, q); queueMicrotask(() => flushRpc(url)); }
+    q.push({ id: ++rpcSeq, method, params, resolve, reject });
+  });
+}
+
+async function postRpc(url, calls) {
+  const body = calls.map(c => ({ jsonrpc:"2.0", id:c.id, method:c.method, params:c.params }));
+  const r = await safeFetch(url, { method:"POST", headers:{"Content-Type":"application/json"}, body:JSON.stringify(calls.length === 1 ? body[0] : body) });
+  if (r.status === 413) return calls.length === 1 ? [{ id:calls[0].id, error:{ message:"response size exceeded" } }] : null;
+  const out = await r.json();
+  if (Array.isArray(out)) return out;
+  if (calls.length > 1 && RPC_TOO_LARGE.test(out?.error?.message || "")) return null;
+  // Any other single reply to a batch (rate limit, auth, ...) applies to every call in it
+  if (!out?.error && calls.length > 1) throw new Error(`batch of ${calls.length}: unexpected response`);
+  return calls.map(c => ({ ...out, id:c.id }));
+}
+
+async function flushRpc(url) {
+  const q = RPC_QUEUES.get(url);
+  RPC_QUEUES.delete(url);
+  for (let i = 0; i < q.length; i += RPC_BATCH_MAX) {
+    const calls = q.slice(i, i + RPC_BATCH_MAX);
+    postRpc(url, calls)
+      .then(out => out || Promise.all(calls.map(c => postRpc(url, [c]).then(o => o[0]))))
+      .then(out => {
+        const byId = new Map(out.map(x => [x?.id, x]));
+        for (const c of calls) {
+          const x = byId.get(c.id);
+          x ? c.resolve(x) : c.reject(new Error(`${c.method}: no response`));
+        }
+      })
+      .catch(e => { for (const c of calls) c.reject(e); });
+  }
+}
+
+// ─── Paginated eth_getLogs ─────────────────────────
+// Splits [from, to] into LOG_CHUNK-block ranges fetched LOG_CONCURRENCY at a
+// time. A range the provider refuses as too large is bisected and retried;
+// results are concatenated in range order, so logs stay sorted by block.
+const LOG_CHUNK = 5000;
+const LOG_CONCURRENCY = 4;
+const LOG_TOO_LARGE = /too many|more than|size exceeded|limit exceeded|range is too large|block range/i;
+
+async function getLogsRange(url, filter, from, to) {
+  const j = await rpc(url, "eth_getLogs", [{ ...filter, fromBlock:"0x"+from.toString(16), toBlock:"0x"+to.toString(16) }]);
+  if (!j.error) return j.result || [];
+  if (from < to && LOG_TOO_LARGE.test(j.error.message || "")) {
+    const mid = Math.floor((from + to) / 2);
+    const left = await getLogsRange(url, filter, from, mid);
+    return left.concat(await getLogsRange(url, filter, mid + 1, to));
+  }
+  throw new Error(`eth_getLogs ${from}-${to}: ${j.error.message}`);
+}
+
+async function getLogs(url, filter, from, to) {
+  const chunks = [];
+  for (let s = from; s <= to; s += LOG_CHUNK) chunks.push([s, Math.min(to, s + LOG_CHUNK - 1)]);
+  const out = new Array(chunks.length);
+  let next = 0;
+  const worker = async () => { while (next < chunks.length) { const i = next++; out[i] = await getLogsRange(url, filter, ...chunks[i]); } };
+  await Promise.all(Array.from({ length: Math.min(LOG_CONCURRENCY, chunks.length) }, worker));
+  return out.flat();
+}
+
+// ─── Top-K selection ──────────────────────────────
+// Keeps the k highest-scoring items in a bounded min-heap: O(n log k) time,
+// O(k) memory. Ties keep the earlier item, so sorted() matches a stable
+// sort-then-slice over the same input.
+class TopK {
+  constructor(k, score) { this.k = k; this.score = score; this.h = []; this.seq = 0; }
+  // a ranks below b: lower score, or same score but pushed later
+  static below(a, b) { return a.s < b.s || (a.s === b.s && a.n > b.n); }
+  push(item) {
+    const e = { s:this.score(item), n:this.seq++, item }, h = this.h;
+    if (h.length < this.k) {
+      h.push(e);
+      for (let i = h.length - 1; i > 0;) {
+        const p = (i - 1) >> 1;
+        if (!TopK.below(h[i], h[p])) break;
+        [h[i], h[p]] = [h[p], h[i]]; i = p;
+      }
+    } else if (this.k > 0 && e.s > h[0].s) {
+      h[0] = e;
+      for (let i = 0;;) {
+        const l = 2 * i + 1, r = l + 1;
+        let m = i;
+        if (l < h.length && TopK.below(h[l], h[m])) m = l;
+        if (r < h.length && TopK.below(h[r], h[m])) m = r;
+        if (m === i) break;
+        [h[i], h[m]] = [h[m], h[i]]; i = m;
+      }
+    }
+  }
+  sorted() { return this.h.slice().sort((a, b) => TopK.below(a, b) ? 1 : -1).map(e => e.item); }
+  static of(items, k, score) { const t = new TopK(k, score); for (const x of items) t.push(x); return t.sorted(); }
+}
+
+// ─── Streaming JSON ───────────────────────────────
+// Scans a response of the form {"<key>": [ {...}, {...} ]} as bytes arrive and
+// hands each array element's raw text to onItem, without ever holding the
+// whole document. Reading stops as soon as the array closes.
+async function streamJsonArray(res, key, onItem) {
+  const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+  const keyRe = new RegExp(`"${key}"\\s*:\\s*$`);
+  let buf = "", pos = 0, depth = 0, arrDepth = -1, start = -1, inStr = false, esc = false;
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) return;
+    buf += value;
+    for (; pos < buf.length; pos++) {
+      const c = buf.charCodeAt(pos);
+      if (inStr) { if (esc) esc = false; else if (c === 92) esc = true; else if (c === 34) inStr = false; continue; }
+      if (c === 34) inStr = true;
+      else if (c === 123 || c === 91) { // { [
+        if (arrDepth < 0 && c === 91 && depth === 1 && keyRe.test(buf.slice(Math.max(0, pos - key.length - 8), pos))) arrDepth = depth + 1;
+        else if (depth === arrDepth && c === 123) start = pos;
+        depth++;
+      } else if (c === 125 || c === 93) { // } ]
+        depth--;
+        if (depth === arrDepth && start >= 0) { onItem(buf.slice(start, pos + 1)); start = -1; }
+        else if (arrDepth > 0 && depth < arrDepth) { reader.cancel().catch(() => {}); return; }
+      }
+    }
+    // Keep only the element in progress (or a short tail to match the key)
+    const keep = start >= 0 ? start : Math.max(0, buf.length - key.length - 8);
+    buf = buf.slice(keep); pos -= keep; if (start >= 0) start = 0;
+  }
+}
+
+// ═══════════════════════════════════════════════════
+// AGENT 0: YIELD OPTIMIZER
+// ═══════════════════════════════════════════════════
+const isYieldPool = (p) => p.chain === "Base" && p.tvlUsd > 50000 && p.apy > 0 && p.apy < 10000;
+
+// Live pools from DeFiLlama, raced against the last stored snapshot: the
+// snapshot is served (marked stale) only when the live stream has not
+// finished within YIELD_WAIT_MS.
+const YIELD_WAIT_MS = 10000;
+// Pre-filter only (tolerates whitespace around the colon); isYieldPool decides after parsing
+const BASE_CHAIN_RE = /"chain"\s*:\s*"Base"/;
+
+async function fetchYieldPools(signal) {
+  // The whole stream gets the resolver's deadline, not the 8s default
+  const res = await safeFetch("https://yields.llama.fi/pools", { signal }, YIELD_WAIT_MS + 2000);
+
+  // Filter pools while the payload streams in; cheap substring reject
+  // before JSON.parse skips the non-Base majority
+  const top = new TopK(20, p => p.apy);
+  if (res.body) {
+    await streamJsonArray(res, "data", (txt) => {
+      if (!BASE_CHAIN_RE.test(txt)) return;
+      const p = JSON.parse(txt);
+      if (isYieldPool(p)) top.push(p);
+    });
+  } else {
+    for (const p of (await res.json()).data) if (isYieldPool(p)) top.push(p);
+  }
+  return top.sorted();
+}
+
+async function fetchYieldData(env) {
+  try {
+    const r = await resolveFirst([
+      { name:"defillama", run:fetchYieldPools, valid:ps => ps.length > 0 },
+      { name:"snapshot", run:async () => (await readSnapshot(0, env))?.data, valid:d => d.opportunities?.length > 0 },
+    ], { ms:YIELD_WAIT_MS + 2000, wait:YIELD_WAIT_MS });
+    if (!r) throw new Error("DeFiLlama pools unavailable and no stored snapshot");
+    if (r.source === "snapshot") return { ...r.value, stale:true, dataSource:"snapshot" };
+    const basePools = r.value;
+
+    const opportunities = basePools.map(p => {
+      let rs = 0;
+      if (p.tvlUsd < 1000000) rs += 3;
+      else if (p.tvlUsd < 10000000) rs += 2;
+      else if (p.tvlUsd < 50000000) rs += 1;
+      if (p.apy > 500) rs += 2; else if (p.apy > 100) rs += 1;
+      if (p.ilRisk === "yes") rs += 1;
+      if (p.stablecoin) rs -= 1;
+      const risk = rs <= 1 ? "LOW" : rs <= 3 ? "MEDIUM" : "HIGH";
+
+      return {
+        protocol: p.project, pool: p.symbol,
+        apy: Math.round(p.apy * 100) / 100,
+        apyBase: Math.round((p.apyBase || 0) * 100) / 100,
+        apyReward: Math.round((p.apyReward || 0) * 100) / 100,
+        tvl: Math.round(p.tvlUsd),
+        risk, stablecoin: p.stablecoin || false,
+        il7d: p.ilRisk === "no" ? "None" : "Possible",
+      };
+    });
+
+    const avg = opportunities.length ? Math.round(opportunities.reduce((s,o) => s+o.apy, 0) / opportunities.length * 100) / 100 : 0;
+    const tvl = opportunities.reduce((s,o) => s+o.tvl, 0);
+    const stables = opportunities.filter(o => o.stablecoin);
+    const low = opportunities.filter(o => o.risk === "LOW");
+
+    return {
+      agent: "Yield Optimizer", version: "__VERSION__", lastUpdate: new Date().toISOString(), dataSource: r.source,
+      summary: {
+        totalOpportunities: opportunities.length, avgApy: avg, totalTvlTracked: tvl,
+        bestApy: opportunities[0]?.apy || 0, bestProtocol: opportunities[0]?.protocol || "N/A",
+        stablePoolCount: stables.length, bestStableApy: stables[0]?.apy || 0, lowRiskCount: low.length,
+        recommendation: opportunities[0]
+          ? `Top: ${opportunities[0].protocol} ${opportunities[0].pool} at ${opportunities[0].apy}% APY (${opportunities[0].risk} risk)${stables[0] ? ` | Safe: ${stables[0].protocol} at ${stables[0].apy}%` : ""}`
+          : "No opportunities found"
+      },
+      opportunities
+    };
+  } catch(e) { return { agent:"Yield Optimizer", error:e.message, lastUpdate:new Date().toISOString(), opportunities:[], summary:{} }; }
+}
+
+// ═══════════════════════════════════════════════════
+// AGENT 1: SENTIMENT ANALYZER
+// ═══════════════════════════════════════════════════
+async function fetchFearGreed() {
+  try {
+    const r = await safeFetch("https://api.alternative.me/fng/?limit=7");
+    const d = await r.json();
+    if (!d?.data?.length) return null;
+    return {
+      current: { value: parseInt(d.data[0].value), label: d.data[0].value_classification },
+      history: d.data.map(x => ({ value: parseInt(x.value), label: x.value_classification, date: new Date(parseInt(x.timestamp)*1000).toISOString().split("T")[0] })),
+      trend: parseInt(d.data[0].value) > parseInt(d.data[d.data.length-1].value) ? "IMPROVING" : "DECLINING",
+    };
+  } catch(e) { return null; }
+}
+
+async function fetchLlamaCoins() {
+  try {
+    const [prices, changes] = await Promise.all([priceSet("llamaPrices"), priceSet("llamaChanges")]);
+    const list = [];
+    for (const [k,sym] of Object.entries(LLAMA_COINS)) {
+      const p = prices.coins?.[k]; const ch = changes.coins?.[k];
+      if (p) list.push({ symbol:sym, price:p.price, change24h: ch ? Math.round(ch*100)/100 : 0, marketCap:p.mcap||null, volume24h:null, source:"defillama" });
+    }
+    return list.length ? list : null;
+  } catch(e) { return null; }
+}
+
+async function fetchGeckoCoins() {
+  try {
+    const raw = await priceSet("geckoMarkets");
+    if (!Array.isArray(raw)) return null;
+    return raw.map(c => ({ symbol:c.symbol.toUpperCase(), price:c.current_price, change24h:Math.round((c.price_change_percentage_24h||0)*100)/100, change7d:Math.round((c.price_change_percentage_7d_in_currency||0)*100)/100, marketCap:c.market_cap, volume24h:c.total_volume, source:"coingecko" }));
+  } catch(e) { return null; }
+}
+
+async function fetchGlobalMarket() {
+  // CoinGecko preferred, DeFiLlama estimate raced alongside (resolveFirst)
+  const r = await resolveFirst([
+    { name:"coingecko", run:async () => {
+      const d = await priceSet("geckoGlobal");
+      if (!d?.data?.total_market_cap?.usd) return null;
+      return {
+        totalMarketCap: d.data.total_market_cap.usd, totalVolume24h: d.data.total_volume?.usd || 0,
+        btcDominance: Math.round((d.data.market_cap_percentage?.btc||0)*100)/100,
+        ethDominance: Math.round((d.data.market_cap_percentage?.eth||0)*100)/100,
+        marketCapChange24h: Math.round((d.data.market_cap_change_percentage_24h_usd||0)*100)/100,
+      };
+    } },
+    // Estimate from DeFiLlama top coin mcaps (same price set as fetchLlamaCoins)
+    { name:"defillama", run:async () => {
+      const d = await priceSet("llamaPrices");
+      const btcMcap = d.coins?.["coingecko:bitcoin"]?.mcap || 0;
+      const ethMcap = d.coins?.["coingecko:ethereum"]?.mcap || 0;
+      if (!btcMcap) return null;
+      const estTotal = btcMcap / 0.58; // BTC ~58% dominance estimate
+      return { totalMarketCap: Math.round(estTotal), totalVolume24h:0, btcDominance: Math.round(btcMcap/estTotal*10000)/100, ethDominance: ethMcap ? Math.round(ethMcap/estTotal*10000)/100 : 12, marketCapChange24h:0 };
+    } },
+  ], { ms:6000, wait:1500 });
+  return r ? { ...r.value, source:r.source } : null;
+}
+
+// Weighted blend of Fear & Greed, price momentum (mean and breadth of the
+// coins' 24h changes) and the market-cap trend; a missing input counts as a
+// neutral 50. sentiment.py reproduces this bit for bit over historical arrays
+// (for backfills and offline weight evaluation), so keep the two in step.
+const SENTIMENT_WEIGHTS = __SENTIMENT_WEIGHTS__;
+
+function sentimentScore(fgValue, changes, mcapChange) {
+  const W = SENTIMENT_WEIGHTS;
+  let score = (fgValue != null ? fgValue : 50) * W.fearGreed, momentum = null, market = null, avgChange = null;
+  if (changes.length) {
+    avgChange = changes.reduce((s,c)=>s+(c||0),0)/changes.length;
+    const pos = changes.filter(c=>(c||0)>0).length/changes.length;
+    momentum = Math.max(0, Math.min(100, 50+avgChange*4+(pos-0.5)*40));
+  }
+  score += (momentum ?? 50) * W.momentum;
+  if (mcapChange) market = Math.max(0, Math.min(100, 50+mcapChange*5));
+  score += (market ?? 50) * W.market;
+  return { score:Math.round(Math.max(0, Math.min(100, score))), momentum, market, avgChange };
+}
+
+const sentimentLabel = (score) => score>=75?"Extreme Greed":score>=60?"Greed":score>=45?"Neutral":score>=25?"Fear":"Extreme Fear";
+
+async function fetchSentimentData() {
+  try {
+    // Both coin lists race; the table prefers CoinGecko (7d change, volume),
+    // momentum prefers DeFiLlama. The two lists share one fetch per source.
+    const llamaCoins = { name:"defillama", run:fetchLlamaCoins }, geckoCoins = { name:"coingecko", run:fetchGeckoCoins };
+    const [fg, top, momentum, global] = await Promise.all([
+      fetchFearGreed(),
+      resolveFirst([geckoCoins, llamaCoins], { ms:6000, wait:1500 }),
+      resolveFirst([llamaCoins, geckoCoins], { ms:6000, wait:1500 }),
+      fetchGlobalMarket(),
+    ]);
+    const topCoins = !top ? [] : top.source === "coingecko" ? top.value : top.value.map(c => ({...c, change7d:null}));
+
+    const changes = (momentum?.value || []).map(c => c.change24h);
+    const s = sentimentScore(fg ? fg.current.value : null, changes, global?.marketCapChange24h);
+    const W = SENTIMENT_WEIGHTS, pct = (w) => `${Math.round(w * 100)}%`, sources = [];
+    if (fg) sources.push({source:"Fear & Greed Index", value:fg.current.value, label:fg.current.label, weight:pct(W.fearGreed)});
+    if (s.momentum !== null) sources.push({source:"Price Momentum", value:Math.round(s.momentum), avgChange24h:Math.round(s.avgChange*100)/100, weight:pct(W.momentum)});
+    if (s.market !== null) sources.push({source:"Market Cap Trend", value:Math.round(s.market), change24h:global.marketCapChange24h, weight:pct(W.market)});
+
+    const score = s.score, lbl = sentimentLabel(score);
+    const dir = score>=65?"BULLISH":score<=35?"BEARISH":"NEUTRAL";
+    const rec = score>=75?"Extreme greed - historically a sell signal. Consider taking profits."
+      :score>=60?"Greed - momentum positive but stay cautious. Consider DCA out of risky positions."
+      :score>=45?"Neutral - no strong signal. Good time to research and set limit orders."
+      :score>=25?"Fear - potential buying opportunity. Consider DCA into high-conviction assets."
+      :"Extreme fear - historically a strong buy signal. Maximum opportunity but also uncertainty.";
+
+    return {
+      agent:"Sentiment Analyzer", version:"__VERSION__", lastUpdate:new Date().toISOString(),
+      summary:{ sentimentScore:score, sentimentLabel:lbl, marketDirection:dir, totalMarketCap:global?.totalMarketCap||0, totalVolume24h:global?.totalVolume24h||0, btcDominance:global?.btcDominance||0, ethDominance:global?.ethDominance||0, marketCapChange24h:global?.marketCapChange24h||0, recommendation:rec },
+      fearGreed: fg||{current:{value:0,label:"Unavailable"},history:[],trend:"N/A"},
+      sentimentSources: sources, topCoins, globalMetrics: global||{},
+    };
+  } catch(e) { return { agent:"Sentiment Analyzer", error:e.message, lastUpdate:new Date().toISOString(), topCoins:[], summary:{} }; }
+}
+
+// Daily history backfilled by `sentiment.py backfill` into AGENT_KV: columnar
+// {weights, start, step, score, fearGreed, momentum, market}, one entry per day
+// from start (unix seconds, UTC midnight). The route appends today's live score
+// when the backfill used the deployed weights.
+const SENTIMENT_HISTORY_KEY = "sentiment:history:v1";
+const SENTIMENT_HISTORY_READ_S = 300;
+const HISTORY_COLUMNS = ["score", "fearGreed", "momentum", "market"];
+let sentimentHistory = null, sentimentHistoryAt = 0;
+
+async function readSentimentHistory(env) {
+  if (env.AGENT_KV && Date.now() - sentimentHistoryAt > SENTIMENT_HISTORY_READ_S * 1000) {
+    try { sentimentHistory = (await env.AGENT_KV.get(SENTIMENT_HISTORY_KEY, "json")) || sentimentHistory; } catch(e) {}
+    sentimentHistoryAt = Date.now();
+  }
+  return sentimentHistory;
+}
+
+function sentimentSeries(hist, live, days) {
+  const step = hist?.step || 86400, today = Math.floor(Date.now() / 1000 / step) * step;
+  const out = { weights: hist?.weights || SENTIMENT_WEIGHTS, start: hist ? hist.start : today, step, live:false };
+  for (const k of HISTORY_COLUMNS) out[k] = hist ? hist[k].slice(-days) : [];
+  out.start += ((hist?.score.length || 0) - out.score.length) * step;
+  const sameWeights = !hist || ["fearGreed", "momentum", "market"].every(k => hist.weights[k] === SENTIMENT_WEIGHTS[k]);
+  if (live?.summary?.sentimentScore != null && sameWeights && out.start + out.score.length * step <= today) {
+    const src = (name) => live.sentimentSources?.find(x => x.source === name)?.value ?? null;
+    // Days between the end of the backfill and today stay null
+    while (out.start + out.score.length * step < today) for (const k of HISTORY_COLUMNS) out[k].push(null);
+    out.score.push(live.summary.sentimentScore); out.fearGreed.push(src("Fear & Greed Index"));
+    out.momentum.push(src("Price Momentum")); out.market.push(src("Market Cap Trend"));
+    out.live = true;
+    const extra = out.score.length - days;
+    if (extra > 0) { for (const k of HISTORY_COLUMNS) out[k] = out[k].slice(extra); out.start += extra * step; }
+  }
+  return out;
+}
+
+// ═══════════════════════════════════════════════════
+// AGENT 2: WHALE TRACKER
+// ═══════════════════════════════════════════════════
+// Cursor + rolling window of qualifying transfers, persisted in KV
+// (env.AGENT_KV) so each refresh only scans blocks since the last run.
+// Without the binding the state lives for the lifetime of the isolate.
+const WHALE_STATE_KEY = "whale:state:v1";
+let whaleState = null;
+
+async function loadWhaleState(env) {
+  if (!env.AGENT_KV) return whaleState;
+  try { return await env.AGENT_KV.get(WHALE_STATE_KEY, "json"); } catch(e) { return whaleState; }
+}
+
+async function saveWhaleState(env, st) {
+  whaleState = st;
+  if (env.AGENT_KV) { try { await env.AGENT_KV.put(WHALE_STATE_KEY, JSON.stringify(st)); } catch(e) {} }
+}
+
+// Tracked tokens, set by the generator from the whale config (worker_template.py).
+// threshold is in base units; addressEnv lets a deployment override the address.
+const WHALE_ASSETS = __WHALE_ASSETS__;
+const TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef";
+const ZERO_ADDR = "0x0000000000000000000000000000000000000000";
+const DEAD_ADDR = "0x000000000000000000000000000000000000dead";
+
+// Base units -> token amount with 4 decimals, without going through a float for the integer part
+const tokenAmount = (v, a) => Number(v / a.unit) + Number(v % a.unit * 10000n / a.unit) / 10000;
+
+async function fetchWhaleData(env) {
+  try {
+    const RPC = env.ALCHEMY_URL || "https://base-mainnet.g.alchemy.com/v2/2rxzAb3pSRGOv26opqwLo";
+    const NANSEN = env.NANSEN_API_KEY || null;
+    await loadLabelRegistry(env);
+
+    const assets = WHALE_ASSETS.map(a => ({ ...a, address:(env[a.addressEnv] || a.address).toLowerCase(), unit:10n ** BigInt(a.decimals) }));
+    const byAddress = new Map(assets.map(a => [a.address, a]));
+
+    // Get latest block — keep a window of the last __SCAN_BLOCKS__ blocks (~__WINDOW_TEXT__)
+    const latest = parseInt((await rpc(RPC, "eth_blockNumber")).result, 16);
+    const windowStart = Math.max(0, latest - __SCAN_BLOCKS__);
+
+    // Incremental scan: only fetch blocks after the persisted cursor when the
+    // saved window still covers windowStart and was built with the same asset table
+    const sig = assets.map(a => `${a.address}:${a.threshold}`).join(",");
+    const prev = await loadWhaleState(env);
+    const incremental = !!prev && prev.sig === sig && prev.from <= windowStart && prev.cursor >= windowStart - 1 && prev.cursor <= latest;
+    const scanFrom = incremental ? prev.cursor + 1 : windowStart;
+
+    // One chunked getLogs over every tracked token (address array); a failed range marks the scan incomplete
+    let logs = [], complete = true;
+    if (scanFrom <= latest) {
+      logs = await getLogs(RPC, { address:assets.map(a => a.address), topics:[TRANSFER_TOPIC] }, scanFrom, latest)
+        .catch(() => { complete = false; return []; });
+    }
+
+    const transfers = incremental ? prev.transfers.filter(t => t.blockNumber >= windowStart) : [];
+
+    for (const l of logs) {
+      try {
+        const a = byAddress.get(l.address.toLowerCase());
+        if (!a) continue;
+        const v = BigInt(l.data);
+        if (v >= a.threshold) {
+          const f = "0x"+l.topics[1].slice(26), t = "0x"+l.topics[2].slice(26);
+          transfers.push({ asset:a.symbol, chain:"Base", from:f, to:t, amount:tokenAmount(v, a),
+            txHash:l.transactionHash, blockNumber:parseInt(l.blockNumber,16),
+            type: f===ZERO_ADDR?"MINT":t===DEAD_ADDR?"BURN":"TRANSFER" });
+        }
+      } catch(e) {}
+    }
+
+    // Only advance the cursor when every range came back complete. The state
+    // keeps transfers unlabeled; labels are applied per response below, so a
+    // reloaded label registry or new Nansen labels reach the whole window.
+    if (complete) await saveWhaleState(env, { sig, from:windowStart, cursor:latest, transfers });
+
+    // Nansen enrichment (silent, no UI exposure)
+    const nLabels = {};
+    const realm = assets.find(a => a.symbol === "REALM");
+    if (NANSEN && realm) {
+      try {
+        const nRes = await safeFetch(`https://api.nansen.ai/api/v1/smart-money/dex-trades?chain=base&token_address=${realm.address}&time_period=24h&limit=20`,
+          { headers:{"apiKey":NANSEN,"Content-Type":"application/json"} }, 10000);
+        const nData = await nRes.json();
+        for (const tr of (nData?.data||[])) { if (tr.wallet_address && tr.wallet_label) nLabels[tr.wallet_address.toLowerCase()] = tr.wallet_label; }
+      } catch(e) {}
+    }
+    // Known labels win over Nansen's; rows are copies, the stored window is untouched
+    const labelOf = (a) => labelLc(a) || nLabels[a] || null;
+    const rows = transfers.map(t => ({ ...t, fromLabel:labelOf(t.from), toLabel:labelOf(t.to) }));
+
+    const { byAsset, uniq, labeled, exFlows, toEx, fromEx } = whaleSummary(rows, assets.map(a => a.symbol));
+    const flow = toEx>fromEx?"DISTRIBUTION":fromEx>toEx?"ACCUMULATION":"NEUTRAL";
+
+    return {
+      agent:"Whale Tracker", version:"__VERSION__", lastUpdate:new Date().toISOString(),
+      summary: {
+        trackedPeriod:"Last ~__WINDOW_TEXT__", whaleTransfers:transfers.length,
+        realmTransfers:byAsset.REALM?.transfers || 0, wethTransfers:byAsset.WETH?.transfers || 0,
+        totalVolumeRealm:byAsset.REALM?.volume || 0, totalVolumeWeth:byAsset.WETH?.volume || 0, byAsset,
+        uniqueWhales:uniq, labeledAddresses:labeled, exchangeFlows:exFlows, flowDirection:flow,
+        trend: transfers.length>10?"HIGH_ACTIVITY":transfers.length>3?"NORMAL":"QUIET",
+        alert: transfers.length>10
+          ? `High activity: ${transfers.length} whale transfers. ${flow==="DISTRIBUTION"?"Selling pressure.":flow==="ACCUMULATION"?"Buying signal.":"Mixed flow."}`
+          : transfers.length>0
+          ? `${transfers.length} transfers in the last __WINDOW_SHORT__. ${labeled} from labeled addresses.`
+          : "No large transfers (__ALERT_THRESHOLDS__) in the last __WINDOW_TEXT__."
+      },
+      transfers: TopK.of(rows, 30, t => t.blockNumber),
+    };
+  } catch(e) { return { agent:"Whale Tracker", error:e.message, lastUpdate:new Date().toISOString(), transfers:[], summary:{} }; }
+}
+
+// ═══════════════════════════════════════════════════
+// AGENT 3: LAUNCHPAD INDEXER
+// ═══════════════════════════════════════════════════
+// Incrementally ingests AgentLaunched / TokensBought / TokensSold from
+// AgentLaunchpad into per-agent OHLC candles. Each resolution is a fixed ring
+// of buckets (slot = floor(t / res) % size), so an update and a bucket lookup
+// are O(1) and the stored state never grows. State (cursor + rings) lives in
+// KV; a cold start backfills at most LAUNCHPAD.scanMax blocks per run.
+const LAUNCHPAD = __LAUNCHPAD__;
+const LAUNCH_STATE_KEY = "launchpad:state:v1";
+const LAUNCH_READ_S = 30; // min seconds between KV reads on the candles route
+let launchState = null, launchStateAt = 0;
+
+async function loadLaunchState(env) {
+  if (!env.AGENT_KV) return launchState;
+  try { return await env.AGENT_KV.get(LAUNCH_STATE_KEY, "json"); } catch(e) { return launchState; }
+}
+
+async function saveLaunchState(env, st) {
+  launchState = st; launchStateAt = Date.now();
+  if (env.AGENT_KV) { try { await env.AGENT_KV.put(LAUNCH_STATE_KEY, JSON.stringify(st)); } catch(e) {} }
+}
+
+async function readLaunchState(env) {
+  if (!launchState || Date.now() - launchStateAt > LAUNCH_READ_S * 1000) {
+    launchState = (await loadLaunchState(env)) || launchState; launchStateAt = Date.now();
+  }
+  return launchState;
+}
+
+// 32-byte ABI word i of log data; 18-decimal amounts -> Number with 4 decimals
+const abiWord = (data, i) => BigInt("0x" + data.slice(2 + i * 64, 66 + i * 64));
+const fromWad = (v) => Number(v / 10n ** 14n) / 10000;
+const fromWadPrice = (v) => Number(v) / 1e18;
+
+const newRing = (size) => ({ t:new Array(size).fill(0), o:new Array(size).fill(0), h:new Array(size).fill(0),
+  l:new Array(size).fill(0), c:new Array(size).fill(0), v:new Array(size).fill(0), n:new Array(size).fill(0) });
+
+function ringAdd(r, res, ts, open, price, vol) {
+  const t = Math.floor(ts / res) * res, i = (t / res) % r.t.length;
+  if (r.t[i] > t) return; // older than the ring's window
+  if (r.t[i] !== t) { r.t[i] = t; r.o[i] = r.h[i] = r.l[i] = open; r.v[i] = 0; r.n[i] = 0; }
+  if (price > r.h[i]) r.h[i] = price;
+  if (price < r.l[i]) r.l[i] = price;
+  r.c[i] = price; r.v[i] = Math.round((r.v[i] + vol) * 10000) / 10000; r.n[i]++;
+}
+
+// Buckets still inside the ring's window, oldest first: [t, o, h, l, c, volume, trades]
+function ringCandles(r, res, now) {
+  const size = r.t.length, end = Math.floor(now / res), out = [];
+  for (let b = end - size + 1; b <= end; b++) {
+    const i = ((b % size) + size) % size;
+    if (r.t[i] === b * res) out.push([r.t[i], r.o[i], r.h[i], r.l[i], r.c[i], r.v[i], r.n[i]]);
+  }
+  return out;
+}
+
+function applyLaunchLog(st, l, ts, feeBps) {
+  const id = String(BigInt(l.topics[1]));
+  if (l.topics[0] === LAUNCHPAD.topics.launched) {
+    st.agents[id] = { token:"0x"+l.topics[2].slice(26), basePrice:fromWadPrice(abiWord(l.data, 0)), slope:fromWadPrice(abiWord(l.data, 1)),
+      launchedAt:ts, price:fromWadPrice(abiWord(l.data, 0)), trades:0, volume:0,
+      rings:Object.fromEntries(LAUNCHPAD.resolutions.map(([res, size]) => [res, newRing(size)])) };
+    return;
+  }
+  const a = st.agents[id];
+  if (!a) return; // launched before the indexed range
+  const buy = l.topics[0] === LAUNCHPAD.topics.bought;
+  // TokensBought: realmSpent, tokensReceived, newPrice; TokensSold: tokensSold, realmReceived, newPrice.
+  // realmSpent is gross of the trade fee but realmReceived is net, so sells are
+  // grossed back up with the current tradeFee to keep volume on one basis.
+  const vol = fromWad(buy ? abiWord(l.data, 0) : abiWord(l.data, 1) * 10000n / (10000n - feeBps)), price = fromWadPrice(abiWord(l.data, 2));
+  for (const [res] of LAUNCHPAD.resolutions) ringAdd(a.rings[res], res, ts, a.price, price, vol);
+  a.price = price; a.trades++; a.volume = Math.round((a.volume + vol) * 10000) / 10000;
+}
+
+async function fetchLaunchpadData(env) {
+  try {
+    const RPC = env.ALCHEMY_URL || "https://base-mainnet.g.alchemy.com/v2/2rxzAb3pSRGOv26opqwLo";
+    const head = (await rpc(RPC, "eth_getBlockByNumber", ["latest", false])).result;
+    const latest = parseInt(head.number, 16), headTs = parseInt(head.timestamp, 16);
+
+    const sig = `${LAUNCHPAD.address}:${LAUNCHPAD.resolutions.join(";")}`;
+    let st = await loadLaunchState(env);
+    if (!st || st.sig !== sig || st.cursor > latest) st = { sig, cursor:Math.max(0, latest - LAUNCHPAD.backfillBlocks) - 1, agents:{} };
+
+    // Scan at most scanMax blocks; events are applied only once the whole range came back
+    const from = st.cursor + 1, to = Math.min(latest, from + LAUNCHPAD.scanMax - 1);
+    if (from <= to) {
+      const T = LAUNCHPAD.topics;
+      const [logs, feeBps] = await Promise.all([
+        getLogs(RPC, { address:LAUNCHPAD.address, topics:[[T.launched, T.bought, T.sold]] }, from, to),
+        ethCall(RPC, LAUNCHPAD.address, LAUNCHPAD.selectors.tradeFee, "latest").then(BigInt)]);
+      logs.sort((x, y) => parseInt(x.blockNumber, 16) - parseInt(y.blockNumber, 16) || parseInt(x.logIndex, 16) - parseInt(y.logIndex, 16));
+      for (const l of logs) {
+        try { applyLaunchLog(st, l, headTs - (latest - parseInt(l.blockNumber, 16)) * LAUNCHPAD.blockTime, feeBps); } catch(e) {}
+      }
+      st.cursor = to;
+      await saveLaunchState(env, st);
+    }
+
+    // 24h stats from the coarsest ring
+    const [dayRes] = LAUNCHPAD.resolutions[LAUNCHPAD.resolutions.length - 1];
+    let trades24h = 0, volume24h = 0;
+    const rows = Object.entries(st.agents).map(([id, a]) => {
+      const day = ringCandles(a.rings[dayRes], dayRes, headTs).filter(c => c[0] > headTs - 86400);
+      const vol = day.reduce((s, c) => s + c[5], 0), n = day.reduce((s, c) => s + c[6], 0);
+      trades24h += n; volume24h += vol;
+      const open = day.length ? day[0][1] : a.price;
+      return { agentId:Number(id), token:a.token, price:a.price, change24h:open ? Math.round((a.price/open - 1) * 10000) / 100 : 0,
+        volume24h:Math.round(vol * 10000) / 10000, trades24h:n, trades:a.trades, volume:a.volume };
+    });
+
+    return {
+      agent:"Launchpad Indexer", version:"__VERSION__", lastUpdate:new Date().toISOString(),
+      summary: {
+        trackedLaunches:rows.length, trades24h, volume24hRealm:Math.round(volume24h * 10000) / 10000,
+        indexedBlock:st.cursor, blocksBehind:latest - st.cursor,
+        alert: latest - st.cursor > LAUNCHPAD.scanMax ? `Backfilling launchpad history (${latest - st.cursor} blocks behind).`
+          : rows.length ? `${rows.length} launches tracked, ${trades24h} trades in the last 24h.` : "No agent launches in the indexed range."
+      },
+      launches: TopK.of(rows, 50, r => r.volume24h),
+    };
+  } catch(e) { return { agent:"Launchpad Indexer", error:e.message, lastUpdate:new Date().toISOString(), launches:[], summary:{} }; }
+}
+
+// ─── Bonding Curve ──────────────────────────────
+// Bit-exact port of AgentLaunchpad's _calculateBuyTokens / _calculateSellReturn /
+// _sqrt / _currentPrice and quoteBuy / quoteSell. Every step is checked like
+// Solidity 0.8 (out-of-range -> panic 0x11, division by zero -> panic 0x12), so
+// inputs that revert on-chain throw a CurveRevert here. Launch state is read
+// once per block and shared by every quote against that block; a depth curve
+// costs no eth_call. launchpad.py has the Python twin, and
+// scripts/verify-curve.js diffs both against the contract.
+const U256_MAX = (1n << 256n) - 1n, WAD = 10n ** 18n;
+class CurveRevert extends Error {}
+const u256 = (v) => { if (v < 0n || v > U256_MAX) throw new CurveRevert("panic 0x11"); return v; };
+const udiv = (a, b) => { if (b === 0n) throw new CurveRevert("panic 0x12"); return a / b; };
+
+function curveSqrt(x) {
+  if (x === 0n) return 0n;
+  let z = udiv(u256(x + 1n), 2n), y = x;
+  while (z < y) { y = z; z = udiv(u256(udiv(x, z) + z), 2n); }
+  return y;
+}
+
+const curvePrice = (supply, basePrice, slope) => u256(basePrice + udiv(u256(slope * supply), WAD));
+
+function curveBuyTokens(supply, realmAmount, basePrice, slope) {
+  if (slope === 0n) return udiv(u256(realmAmount * WAD), basePrice);
+  const b = u256(basePrice + udiv(u256(slope * supply), WAD));
+  const disc = u256(u256(b * b) + u256(u256(2n * slope) * realmAmount));
+  return udiv(u256(u256(curveSqrt(disc) - b) * WAD), slope);
+}
+
+function curveSellReturn(supply, tokenAmount, basePrice, slope) {
+  if (tokenAmount > supply) throw new CurveRevert("Launchpad: sell exceeds supply");
+  const s1 = supply - tokenAmount, ds = supply - s1;
+  return u256(udiv(u256(basePrice * ds), WAD) + udiv(u256(u256(slope * u256(supply + s1)) * ds), 2n * 10n ** 36n));
+}
+
+// l: { supply, basePrice, slope, feeBps } as returned by curveLaunches()
+function quoteBuy(l, realmAmount) {
+  const fee = udiv(u256(realmAmount * l.feeBps), 10000n);
+  return curveBuyTokens(l.supply, u256(realmAmount - fee), l.basePrice, l.slope);
+}
+
+function quoteSell(l, tokenAmount) {
+  const gross = curveSellReturn(l.supply, tokenAmount, l.basePrice, l.slope);
+  return u256(gross - udiv(u256(gross * l.feeBps), 10000n));
+}
+
+// Launch state per agent at one block: getLaunch + tradeFee in one batch, then
+// the token's totalSupply. Entries are promises, so concurrent quote requests
+// for the same block share the reads.
+const CURVE_STATE = { block:-1, fee:null, launches:new Map() };
+const callData = (sel, ...args) => sel + args.map(a => BigInt(a).toString(16).padStart(64, "0")).join("");
+
+async function ethCall(url, to, data, tag) {
+  const j = await rpc(url, "eth_call", [{ to, data }, tag]);
+  if (j.error) throw new Error(`eth_call ${data.slice(0, 10)}: ${j.error.message}`);
+  return j.result;
+}
+
+async function curveLaunches(env, ids) {
+  const RPC = env.ALCHEMY_URL || "https://base-mainnet.g.alchemy.com/v2/2rxzAb3pSRGOv26opqwLo";
+  const block = parseInt((await rpc(RPC, "eth_blockNumber")).result, 16), tag = "0x" + block.toString(16);
+  if (block !== CURVE_STATE.block) {
+    CURVE_STATE.block = block; CURVE_STATE.launches.clear();
+    CURVE_STATE.fee = ethCall(RPC, LAUNCHPAD.address, LAUNCHPAD.selectors.tradeFee, tag).then(BigInt);
+    CURVE_STATE.fee.catch(() => { if (CURVE_STATE.block === block) CURVE_STATE.block = -1; });
+  }
+  const out = await Promise.all(ids.map(id => {
+    let p = CURVE_STATE.launches.get(id);
+    if (!p) {
+      p = Promise.all([ethCall(RPC, LAUNCHPAD.address, callData(LAUNCHPAD.selectors.getLaunch, id), tag), CURVE_STATE.fee])
+        .then(async ([d, feeBps]) => {
+          const token = "0x" + d.slice(26, 66);
+          if (BigInt(token) === 0n) return null; // not launched
+          const supply = BigInt(await ethCall(RPC, token, LAUNCHPAD.selectors.totalSupply, tag));
+          return { agentId:id, token, realmReserve:abiWord(d, 2), basePrice:abiWord(d, 3), slope:abiWord(d, 4),
+            active:abiWord(d, 7) === 1n, supply, feeBps };
+        });
+      p.catch(() => CURVE_STATE.launches.delete(id));
+      CURVE_STATE.launches.set(id, p);
+    }
+    return p;
+  }));
+  return { block, launches:out };
+}
+
+// "1.5" (whole tokens, up to 18 decimals) -> wei
+function toWei(text) {
+  const m = /^(\d*)(?:\.(\d{0,18}))?$/.exec(text.trim());
+  if (!m || !(m[1] || m[2])) throw new CurveRevert(`bad amount ${JSON.stringify(text)}`);
+  return BigInt(m[1] || "0") * WAD + BigInt((m[2] || "").padEnd(18, "0"));
+}
+
+// Default depth ladders: buys of 1..1M REALM, sells of 5%..100% of supply
+const DEPTH_REALM = [1n, 2n, 5n].flatMap(d => [0, 1, 2, 3, 4, 5].map(k => d * 10n ** BigInt(k) * WAD)).sort((a, b) => a < b ? -1 : a > b ? 1 : 0);
+const DEPTH_SELL_PCT = [5n, 10n, 20n, 30n, 40n, 50n, 60n, 70n, 80n, 90n, 100n];
+
+function quoteTable(l, side, amounts) {
+  return amounts.map(amount => {
+    try {
+      if (side === "buy") {
+        const out = quoteBuy(l, amount);
+        return { in:amount.toString(), out:out.toString(), priceAfter:curvePrice(u256(l.supply + out), l.basePrice, l.slope).toString() };
+      }
+      const out = quoteSell(l, amount);
+      const row = { in:amount.toString(), out:out.toString(), priceAfter:curvePrice(l.supply - amount, l.basePrice, l.slope).toString() };
+      // sellTokens also requires the gross return to fit in the reserve
+      if (curveSellReturn(l.supply, amount, l.basePrice, l.slope) > l.realmReserve) row.exceedsReserve = true;
+      return row;
+    } catch(e) {
+      if (!(e instanceof CurveRevert)) throw e;
+      return { in:amount.toString(), revert:e.message };
+    }
+  });
+}
+
+// ─── Time Series ────────────────────────────────
+// Every stored snapshot appends the numeric fields of its payload's summary to
+// per-agent rollup rings, one per SERIES resolution (1m / 1h / 1d). Like the
+// launchpad candles, a ring is a fixed set of buckets (slot = floor(t / res) %
+// size); a bucket keeps count, sum, min and max per field, so history is read
+// back as avg/min/max without recomputing an agent and the state never grows.
+// One agent's rings are stored column-wise under one KV key; the isolate keeps
+// its own copy, which wins over an older (eventually consistent) KV read.
+const SERIES = __SERIES__;
+const seriesKey = (id) => `agent:${id}:series:v1`;
+const SERIES_READ_S = 30; // min seconds between KV reads on the history route
+const SERIES_STATE = new Map();
+
+const newSeriesField = (size) => ({ n:new Array(size).fill(0), s:new Array(size).fill(0), l:new Array(size).fill(0), h:new Array(size).fill(0) });
+
+function seriesAdd(r, res, ts, values) {
+  const t = Math.floor(ts / res) * res, size = r.t.length, i = (t / res) % size;
+  if (r.t[i] > t) return; // older than the ring's window
+  if (r.t[i] !== t) { r.t[i] = t; for (const f of Object.values(r.f)) f.n[i] = f.s[i] = f.l[i] = f.h[i] = 0; }
+  for (const [k, v] of Object.entries(values)) {
+    const f = r.f[k] || (r.f[k] = newSeriesField(size));
+    if (!f.n[i] || v < f.l[i]) f.l[i] = v;
+    if (!f.n[i] || v > f.h[i]) f.h[i] = v;
+    f.s[i] = Math.round((f.s[i] + v) * 10000) / 10000; f.n[i]++;
+  }
+}
+
+async function readSeries(id, env, maxAge) {
+  let e = SERIES_STATE.get(id);
+  if (!e) { e = { st:null, readAt:0 }; SERIES_STATE.set(id, e); }
+  if (env.AGENT_KV && Date.now() - e.readAt >= maxAge * 1000) {
+    try {
+      const st = await env.AGENT_KV.get(seriesKey(id), "json");
+      if (st && (!e.st || st.at > e.st.at)) e.st = st;
+    } catch(err) {}
+    e.readAt = Date.now();
+  }
+  return e;
+}
+
+async function appendSeries(id, env, snap) {
+  const values = {};
+  for (const [k, v] of Object.entries(snap.data.summary || {})) if (typeof v === "number" && Number.isFinite(v)) values[k] = v;
+  if (!Object.keys(values).length) return;
+  const e = await readSeries(id, env, 0), sig = SERIES.resolutions.join(";");
+  if (!e.st || e.st.sig !== sig) e.st = { sig, at:0, rings:Object.fromEntries(SERIES.resolutions.map(([res, size]) => [res, { t:new Array(size).fill(0), f:{} }])) };
+  if (snap.at <= e.st.at) return;
+  for (const [res] of SERIES.resolutions) seriesAdd(e.st.rings[res], res, snap.at / 1000, values);
+  e.st.at = snap.at;
+  if (env.AGENT_KV) { try { await env.AGENT_KV.put(seriesKey(id), JSON.stringify(e.st)); } catch(err) {} }
+}
+
+// "90", "15m", "6h", "7d", "2w", "1y" -> seconds
+const DURATION_S = { s:1, m:60, h:3600, d:86400, w:604800, y:31536000 };
+function parseDuration(v) {
+  const m = String(v).match(/^(\d+)([smhdwy]?)$/);
+  if (!m || +m[1] <= 0) throw new Error(`bad duration: ${v} (e.g. 90, 15m, 6h, 7d)`);
+  return +m[1] * DURATION_S[m[2] || "s"];
+}
+
+// The last `range` seconds as step-sized points, from the coarsest ring that
+// covers the range at the requested step (else the finest that covers it at
+// all). step is rounded up to a multiple of that ring's resolution and so that
+// the range fits in SERIES.maxPoints points.
+function seriesHistory(st, range, step, now, fields) {
+  const R = SERIES.resolutions;
+  let covering = R.filter(([res, size]) => res * size >= range);
+  if (!covering.length) covering = [R[R.length - 1]];
+  const want = step || Math.ceil(range / SERIES.maxPoints);
+  const [res, size] = covering.filter(([r]) => r <= want).pop() || covering[0];
+  step = Math.ceil(Math.max(want, range / SERIES.maxPoints, res) / res) * res;
+
+  const ring = st?.rings[res], names = ring ? Object.keys(ring.f).filter(k => !fields || fields.includes(k)) : [];
+  const out = { range, step, res, t:[], fields:Object.fromEntries(names.map(k => [k, { avg:[], min:[], max:[], n:[] }])) };
+  if (!ring) return out;
+  const end = Math.floor(now / res), start = now - range;
+  for (let b = end - size + 1; b <= end; b++) {
+    const i = ((b % size) + size) % size, t = b * res;
+    if (ring.t[i] !== t || t + res <= start) continue;
+    const p = Math.floor(t / step) * step, fresh = out.t[out.t.length - 1] !== p;
+    if (fresh) out.t.push(p);
+    for (const k of names) {
+      const f = ring.f[k], o = out.fields[k];
+      if (fresh) { o.avg.push(0); o.min.push(null); o.max.push(null); o.n.push(0); }
+      const j = o.n.length - 1;
+      if (!f.n[i]) continue;
+      o.avg[j] += f.s[i]; o.n[j] += f.n[i];
+      if (o.min[j] === null || f.l[i] < o.min[j]) o.min[j] = f.l[i];
+      if (o.max[j] === null || f.h[i] > o.max[j]) o.max[j] = f.h[i];
+    }
+  }
+  for (const o of Object.values(out.fields)) o.avg = o.avg.map((s, j) => o.n[j] ? Math.round(s / o.n[j] * 10000) / 10000 : null);
+  return out;
+}
+
+// ─── Snapshots ──────────────────────────────────
+// With AGENT_KV bound, cron triggers recompute agent payloads on a fixed
+// cadence (SCHEDULE maps each cron expression to the agents it refreshes) and
+// store them; the request path then only reads the stored snapshot. Without
+// KV, or before the first cron run, payloads are computed on demand.
+const SCHEDULE = __SCHEDULE__;
+const snapshotKey = (id) => `agent:${id}:snapshot`;
+
+async function computeSnapshot(id, env) {
+  const snap = { at:Date.now(), data: await FETCHERS[id](env) };
+  // Payloads served from a fallback copy (stale) are returned but not stored again
+  if (!snap.data.error && !snap.data.stale) {
+    if (env.AGENT_KV) { try { await env.AGENT_KV.put(snapshotKey(id), JSON.stringify(snap)); } catch(e) {} }
+    await appendSeries(id, env, snap);
+  }
+  return snap;
+}
+
+async function readSnapshot(id, env) {
+  if (!env.AGENT_KV) return null;
+  try { return await env.AGENT_KV.get(snapshotKey(id), "json"); } catch(e) { return null; }
+}
+
+// ─── Response Cache ─────────────────────────────
+// Per-isolate cache with a TTL per agent. Past the TTL the stale payload is
+// still served for STALE_S while one background refresh runs; concurrent
+// misses share the same in-flight fan-out instead of each hitting upstream.
+// A refresh reads the stored snapshot first and only computes live when the
+// snapshot is missing or older than TTL + STALE_S (cron not running).
+const FETCHERS = [fetchYieldData, fetchSentimentData, fetchWhaleData, fetchLaunchpadData];
+const AGENT_TTL = __AGENT_TTL__; // seconds: yield, sentiment, whale, launchpad
+const STALE_S = 600;
+const RECHECK_S = 10; // min seconds between snapshot reads while waiting for cron
+const CACHE = new Map();
+const CACHE_STATS = { hits:0, total:0 };
+
+function refresh(id, env) {
+  let e = CACHE.get(id);
+  if (!e) { e = { data:null, at:0, checked:0, pending:null }; CACHE.set(id, e); }
+  if (!e.pending) {
+    e.pending = readSnapshot(id, env)
+      .then(snap => snap && Date.now() - snap.at < (AGENT_TTL[id] + STALE_S) * 1000 ? snap : computeSnapshot(id, env))
+      .then(({ at, data }) => {
+        e.checked = Date.now();
+        // Never replace a good payload with an error one
+        if (!data.error) { e.data = data; e.at = at; }
+        return data.error && e.data ? e.data : data;
+      })
+      .finally(() => { e.pending = null; });
+  }
+  return e.pending;
+}
+
+async function cached(id, env, ctx) {
+  const e = CACHE.get(id), now = Date.now();
+  const age = e?.at ? now - e.at : Infinity, ttl = AGENT_TTL[id] * 1000;
+  CACHE_STATS.total++;
+  if (age < ttl) { CACHE_STATS.hits++; return { data:e.data, status:"HIT", age }; }
+  // Past the TTL but re-checked recently (cron not running): served, but reported as stale
+  if (e?.data && now - e.checked < RECHECK_S * 1000) return { data:e.data, status:"STALE", age };
+  if (age < ttl + STALE_S * 1000) {
+    CACHE_STATS.hits++;
+    const p = refresh(id, env);
+    if (ctx) ctx.waitUntil(p);
+    return { data:e.data, status:"STALE", age };
+  }
+  const data = await refresh(id, env);
+  return { data, status:"MISS", age: CACHE.get(id).at ? Date.now() - CACHE.get(id).at : 0 };
+}
+
+function cacheHeaders(status, age) {
+  return { ...CORS_HEADERS, "X-Cache":status, "X-Cache-Age":String(Math.round(age/1000)),
+    "X-Cache-Hit-Ratio":(CACHE_STATS.hits / Math.max(1, CACHE_STATS.total)).toFixed(3) };
+}
+
+// ─── Router ─────────────────────────────────────
+export default {
+  async fetch(request, env, ctx) {
+    if (request.method === "OPTIONS") return new Response(null, { headers: CORS_HEADERS });
+    const url = new URL(request.url), path = url.pathname;
+
+    if (path.startsWith("/metadata/")) {
+      const id = parseInt(path.split("/")[2]);
+      return id >= 0 && id < AGENTS.length
+        ? new Response(JSON.stringify(AGENTS[id]), { headers: CORS_HEADERS })
+        : new Response(JSON.stringify({error:"Not found"}), {status:404, headers:CORS_HEADERS});
+    }
+    if (path === "/api/agents") return new Response(JSON.stringify({agents:AGENTS,total:AGENTS.length}), {headers:CORS_HEADERS});
+
+    if (path.match(/^\/api\/agents\/\d+\/data$/)) {
+      const id = parseInt(path.split("/")[3]);
+      if (id < 0 || id >= FETCHERS.length) return new Response(JSON.stringify({error:"Not found"}), {status:404, headers:CORS_HEADERS});
+      const c = await cached(id, env, ctx);
+      return new Response(JSON.stringify(c.data), {headers:cacheHeaders(c.status, c.age)});
+    }
+
+    // Rollups of an agent's summary fields: ?range=24h&step=15m&fields=a,b
+    // (range defaults to 24h, step to the ring resolution that fits SERIES.maxPoints)
+    const ah = path.match(/^\/api\/agents\/(\d+)\/history$/);
+    if (ah) {
+      const id = parseInt(ah[1]);
+      if (id >= FETCHERS.length) return new Response(JSON.stringify({error:"Not found"}), {status:404, headers:CORS_HEADERS});
+      let range, step;
+      try {
+        range = parseDuration(url.searchParams.get("range") || "24h");
+        step = url.searchParams.get("step") ? parseDuration(url.searchParams.get("step")) : null;
+      } catch(e) { return new Response(JSON.stringify({error:e.message}), {status:400, headers:CORS_HEADERS}); }
+      const fields = url.searchParams.get("fields")?.split(",").map(f => f.trim()).filter(Boolean) || null;
+      const { st } = await readSeries(id, env, SERIES_READ_S);
+      return new Response(JSON.stringify({ agentId:id, name:AGENTS[id].name, updated:st ? new Date(st.at).toISOString() : null,
+        ...seriesHistory(st, range, step, Date.now() / 1000, fields) }), {headers:CORS_HEADERS});
+    }
+
+    // Precomputed candles for one launched agent: ?res=<seconds> (one of LAUNCHPAD.resolutions)
+    const lp = path.match(/^\/api\/launchpad\/(\d+)\/candles$/);
+    if (lp) {
+      const st = await readLaunchState(env), a = st?.agents[lp[1]];
+      const res = parseInt(url.searchParams.get("res") || LAUNCHPAD.resolutions[0][0]);
+      if (!a || !a.rings[res]) return new Response(JSON.stringify({error:"Not found"}), {status:404, headers:CORS_HEADERS});
+      return new Response(JSON.stringify({ agentId:Number(lp[1]), token:a.token, res, price:a.price,
+        candles:ringCandles(a.rings[res], res, Date.now() / 1000) }), {headers:CORS_HEADERS});
+    }
+
+    // Local quotes at the latest block: ?side=buy|sell&amounts=1,10.5 (whole tokens);
+    // without amounts, a full depth curve. Amounts in the response are wei strings.
+    const lq = path.match(/^\/api\/launchpad\/(\d+)\/quotes$/);
+    if (lq) {
+      const side = url.searchParams.get("side") || "buy";
+      if (side !== "buy" && side !== "sell") return new Response(JSON.stringify({error:"side must be buy or sell"}), {status:400, headers:CORS_HEADERS});
+      let amounts;
+      try { amounts = url.searchParams.get("amounts")?.split(",").slice(0, 100).map(toWei); }
+      catch(e) { return new Response(JSON.stringify({error:e.message}), {status:400, headers:CORS_HEADERS}); }
+      let st;
+      try { st = await curveLaunches(env, [lq[1]]); }
+      catch(e) { return new Response(JSON.stringify({error:e.message}), {status:502, headers:CORS_HEADERS}); }
+      const l = st.launches[0];
+      if (!l) return new Response(JSON.stringify({error:"Not launched"}), {status:404, headers:CORS_HEADERS});
+      amounts = amounts || (side === "buy" ? DEPTH_REALM : DEPTH_SELL_PCT.map(p => l.supply * p / 100n).filter(a => a > 0n));
+      return new Response(JSON.stringify({ agentId:Number(lq[1]), block:st.block, side, active:l.active, feeBps:Number(l.feeBps),
+        supply:l.supply.toString(), reserve:l.realmReserve.toString(), price:curvePrice(l.supply, l.basePrice, l.slope).toString(),
+        quotes:quoteTable(l, side, amounts) }), {headers:CORS_HEADERS});
+    }
+
+    // Daily sentiment history (precomputed by sentiment.py) plus today's live score: ?days=365
+    if (path === "/api/sentiment/history") {
+      const days = Math.max(1, Math.min(5000, parseInt(url.searchParams.get("days")) || 365));
+      const [hist, live] = await Promise.all([readSentimentHistory(env), cached(1, env, ctx)]);
+      return new Response(JSON.stringify(sentimentSeries(hist, live.data, days)), {headers:cacheHeaders(live.status, live.age)});
+    }
+
+    if (path === "/api/upstreams") return new Response(JSON.stringify({timestamp:new Date().toISOString(), upstreams:upstreamStats()}), {headers:CORS_HEADERS});
+
+    if (path === "/api/dashboard") {
+      // ?full=1 returns whole payloads, ?fields=a,b projects top-level payload
+      // fields; default stays summary-only
+      const full = url.searchParams.get("full") === "1";
+      const fields = full ? null : (url.searchParams.get("fields") || "summary").split(",").map(f => f.trim()).filter(Boolean);
+      // ?ids=0,1,2 limits the work to those agents (default: all, in id order)
+      const idsParam = url.searchParams.get("ids");
+      const ids = idsParam ? [...new Set(idsParam.split(",").map(Number))].filter(i => Number.isInteger(i) && i >= 0 && i < FETCHERS.length)
+        : FETCHERS.map((_, i) => i);
+      if (!ids.length) return new Response(JSON.stringify({error:"ids must list agent ids"}), {status:400, headers:CORS_HEADERS});
+      const res = await Promise.all(ids.map(i => cached(i, env, ctx)));
+      const status = res.some(c=>c.status==="MISS") ? "MISS" : res.some(c=>c.status==="STALE") ? "STALE" : "HIT";
+      const agents = res.map((c, k) => {
+        const i = ids[k], out = { id:i, name:AGENTS[i].name, status:"active" };
+        for (const k of fields || Object.keys(c.data)) if (c.data[k] !== undefined) out[k] = c.data[k];
+        return out;
+      });
+      return new Response(JSON.stringify({timestamp:new Date().toISOString(), version:"__VERSION__", agents}),
+        {headers:cacheHeaders(status, Math.max(...res.map(c => c.age)))});
+    }
+
+    if (path === "/") return new Response(JSON.stringify({name:"RealmAgents API",version:"__VERSION__",
+      endpoints:["GET /metadata/:id","GET /api/agents","GET /api/agents/:id/data","GET /api/agents/:id/history?range=24h&step=15m","GET /api/dashboard?ids=0,1&full=1|fields=summary,...","GET /api/launchpad/:agentId/candles?res=300","GET /api/launchpad/:agentId/quotes?side=buy|sell&amounts=...","GET /api/sentiment/history?days=365","GET /api/upstreams"],
+      agents:AGENTS.map((a,i)=>({id:i,name:a.name,category:a.category}))
+    }), {headers:CORS_HEADERS});
+
+    return new Response(JSON.stringify({error:"Not found"}), {status:404, headers:CORS_HEADERS});
+  },
+
+  // Cron triggers: recompute the agents scheduled for this expression
+  async scheduled(event, env, ctx) {
+    const ids = SCHEDULE[event.cron] || FETCHERS.map((_, i) => i);
+    ctx.waitUntil(Promise.all(ids.map(id => computeSnapshot(id, env))));
+  }
+};
@@ -0,0 +1,127 @@
+"""
+Generated-artifact writer and manifest
+- write() compares the new content's SHA-256 with the file on disk and only
+  writes when it differs, so untouched files keep their mtime (Vite and
+  wrangler caches stay valid)
+- Writes are atomic: temp file in the same directory, then os.replace
+- <root>/.artifacts.json records every generated file's hash, grouped by
+  top-level directory (agents-api, frontend)
+- Build steps stamp the group digest they built; `stale` tells the next run
+  whether a rebuild/deploy is needed at all
+
+Usage (from the generators):
+  manifest = Manifest(ROOT)
+  manifest.write(path, content)     # -> True if the file changed
+  manifest.save()
+
+Usage (around build steps):
+  python3 artifacts.py stale ~/realmagents frontend && \\
+    (cd ~/realmagents/frontend && npm run build && npx wrangler pages deploy dist) && \\
+    python3 artifacts.py stamp ~/realmagents frontend
+"""
+import hashlib, json, os, sys, tempfile
+
+MANIFEST = ".artifacts.json"
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def atomic_write(path, data):
+    """Write bytes to path via a temp file + rename; keeps the file's mode."""
+    d = os.path.dirname(path) or "."
+    fd, tmp = tempfile.mkstemp(dir=d, prefix="." + os.path.basename(path) + ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        if os.path.exists(path):
+            os.chmod(tmp, os.stat(path).st_mode & 0o7777)
+        else:
+            os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+class Manifest:
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.path = os.path.join(self.root, MANIFEST)
+        try:
+            with open(self.path) as f:
+                self.data = json.load(f)
+        except (OSError, ValueError):
+            self.data = {}
+        self.data.setdefault("artifacts", {})
+        self.data.setdefault("built", {})
+        self.changed = []
+
+    def rel(self, path):
+        return os.path.relpath(os.path.abspath(path), self.root).replace(os.sep, "/")
+
+    def write(self, path, content):
+        """Write content (str or bytes) if it differs from disk; returns True if written."""
+        data = content.encode() if isinstance(content, str) else content
+        digest = sha256(data)
+        try:
+            with open(path, "rb") as f:
+                current = sha256(f.read())
+        except OSError:
+            current = None
+        self.data["artifacts"][self.rel(path)] = {"sha256": digest, "bytes": len(data)}
+        if current == digest:
+            return False
+        atomic_write(path, data)
+        self.changed.append(self.rel(path))
+        return True
+
+    def digest(self, group):
+        """Combined hash of every artifact under one top-level directory."""
+        items = sorted((k, v["sha256"]) for k, v in self.data["artifacts"].items()
+                       if k.split("/", 1)[0] == group)
+        return sha256("\n".join(f"{k} {h}" for k, h in items).encode())
+
+    def stale(self, group):
+        return self.data["built"].get(group) != self.digest(group)
+
+    def stamp(self, group):
+        self.data["built"][group] = self.digest(group)
+
+    def save(self):
+        data = (json.dumps(self.data, indent=2, sort_keys=True) + "\n").encode()
+        try:
+            with open(self.path, "rb") as f:
+                if f.read() == data:
+                    return False
+        except OSError:
+            pass
+        atomic_write(self.path, data)
+        return True
+
+
+def main(argv):
+    if len(argv) != 3 or argv[0] not in ("stale", "stamp", "digest"):
+        print("usage: artifacts.py stale|stamp|digest ROOT GROUP")
+        return 2
+    cmd, root, group = argv[0], os.path.expanduser(argv[1]), argv[2]
+    m = Manifest(root)
+    if cmd == "digest":
+        print(m.digest(group))
+    elif cmd == "stale":
+        if m.stale(group):
+            print(f"[OK] {group}: generated files changed, rebuild needed")
+            return 0
+        print(f"[SKIP] {group}: unchanged since last build")
+        return 1
+    else:
+        m.stamp(group)
+        m.save()
+        print(f"[OK] {group}: stamped {m.digest(group)[:12]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
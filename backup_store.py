@@ -0,0 +1,236 @@
+"""
+Content-addressed backup store for patched files
+- Replaces the per-script .bak / .pre-* copies with one store at <root>/.backups
+- Files are split into content-defined chunks (gear rolling hash), so an edit
+  only stores the chunks around it; chunks are zlib-compressed and stored once
+  by SHA-256
+- Backing up content that is already stored for that file only moves its
+  index entry to the front (repeated patch runs add no data)
+- Retention: keep the newest N backups per file (default 20), optionally
+  dropping ones older than D days; unreferenced chunks are garbage-collected
+- Restore by backup id or by path (latest backup); the current file is backed
+  up first, so a restore can itself be undone
+
+Usage (from the patch scripts):
+  BackupStore(ROOT).backup(path, "fix_agents_v2")
+
+Usage (CLI):
+  python3 backup_store.py list    ~/realmagents [PATH]
+  python3 backup_store.py restore ~/realmagents ID|PATH [--to FILE]
+  python3 backup_store.py prune   ~/realmagents [--keep N] [--days D]
+  python3 backup_store.py adopt   ~/realmagents [--remove]   # ingest old worker.js / App.jsx .bak/.pre-* copies
+"""
+import argparse, hashlib, json, os, random, re, sys, time, zlib
+from artifacts import atomic_write
+
+STORE = ".backups"
+KEEP = 20
+
+# Content-defined chunking: ~4 KB average, 1-16 KB bounds
+CHUNK_MIN, CHUNK_MAX, CHUNK_MASK = 1024, 16384, (1 << 12) - 1
+_rng = random.Random(0x5EA1)
+GEAR = [_rng.getrandbits(64) for _ in range(256)]
+MASK64 = (1 << 64) - 1
+
+# Generator outputs the patch scripts used to copy in place, and the suffixes
+# of those copies (worker.js.v1.bak, App.jsx.bak3, App.jsx.pre-v2fix, ...)
+LEGACY_TARGETS = ("agents-api/worker.js", "frontend/src/App.jsx")
+LEGACY_SUFFIX_RE = re.compile(r"^\.(?:bak(?:\d+|_\w+)?|v\d+\.bak|pre-[\w-]+)$")
+
+
+def chunks(data):
+    """Split bytes at content-defined boundaries (gear hash)."""
+    out, start, n = [], 0, len(data)
+    while start < n:
+        end = min(start + CHUNK_MAX, n)
+        h = 0
+        i = start + CHUNK_MIN
+        cut = end
+        while i < end:
+            h = ((h << 1) + GEAR[data[i]]) & MASK64
+            if not h & CHUNK_MASK:
+                cut = i + 1
+                break
+            i += 1
+        out.append(data[start:cut])
+        start = cut
+    return out
+
+
+def legacy_copies(root):
+    """(copy, original) pairs next to the LEGACY_TARGETS under root, oldest first."""
+    found = []
+    for rel in LEGACY_TARGETS:
+        original = os.path.join(root, *rel.split("/"))
+        d, name = os.path.split(original)
+        for f in sorted(os.listdir(d)) if os.path.isdir(d) else []:
+            if f.startswith(name) and LEGACY_SUFFIX_RE.match(f[len(name):]):
+                found.append((os.path.join(d, f), original))
+    found.sort(key=lambda c: os.path.getmtime(c[0]))
+    return found
+
+
+class BackupStore:
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.dir = os.path.join(self.root, STORE)
+        self.index_path = os.path.join(self.dir, "index.json")
+        try:
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {"next": 1, "backups": []}
+
+    def rel(self, path):
+        return os.path.relpath(os.path.abspath(path), self.root).replace(os.sep, "/")
+
+    def _object(self, digest):
+        return os.path.join(self.dir, "objects", digest[:2], digest[2:])
+
+    def _save(self):
+        os.makedirs(self.dir, exist_ok=True)
+        atomic_write(self.index_path, (json.dumps(self.index, indent=1) + "\n").encode())
+
+    def history(self, rel):
+        return [b for b in self.index["backups"] if b["path"] == rel]
+
+    def backup(self, path, tag="", keep=KEEP):
+        """Back up path; returns (entry, created). Unchanged content is not stored again."""
+        with open(path, "rb") as f:
+            return self.backup_bytes(path, f.read(), tag, keep)
+
+    def backup_bytes(self, path, data, tag="", keep=KEEP):
+        rel = self.rel(path)
+        digest = hashlib.sha256(data).hexdigest()
+        prev = self.history(rel)
+        if prev and prev[-1]["sha256"] == digest:
+            return prev[-1], False
+        for b in prev:
+            if b["sha256"] == digest:
+                # Seen before (e.g. alternating generate/patch states): make it the latest
+                self.index["backups"].remove(b)
+                b.update(time=int(time.time()), tag=tag)
+                self.index["backups"].append(b)
+                self._save()
+                return b, False
+
+        ids = []
+        for c in chunks(data):
+            cid = hashlib.sha256(c).hexdigest()
+            obj = self._object(cid)
+            if not os.path.exists(obj):
+                os.makedirs(os.path.dirname(obj), exist_ok=True)
+                atomic_write(obj, zlib.compress(c, 6))
+            ids.append(cid)
+        entry = {"id": self.index["next"], "path": rel, "tag": tag, "time": int(time.time()),
+                 "size": len(data), "sha256": digest, "chunks": ids}
+        self.index["next"] += 1
+        self.index["backups"].append(entry)
+        if len(prev) + 1 > keep:
+            self.prune(keep=keep)
+        else:
+            self._save()
+        return entry, True
+
+    def read(self, entry):
+        data = b"".join(zlib.decompress(open(self._object(c), "rb").read()) for c in entry["chunks"])
+        if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+            raise ValueError(f"backup {entry['id']} is corrupt (hash mismatch)")
+        return data
+
+    def find(self, target):
+        """Backup by id, or the latest backup of a path."""
+        if str(target).isdigit():
+            for b in self.index["backups"]:
+                if b["id"] == int(target):
+                    return b
+            return None
+        rel = target if not os.path.isabs(target) else self.rel(target)
+        hist = self.history(rel)
+        return hist[-1] if hist else None
+
+    def restore(self, entry, to=None):
+        dest = to or os.path.join(self.root, entry["path"])
+        if os.path.exists(dest) and not to:
+            self.backup(dest, f"pre-restore-{entry['id']}")
+        atomic_write(dest, self.read(entry))
+        return dest
+
+    def prune(self, keep=KEEP, days=None):
+        """Apply retention and delete chunks no backup references; returns (backups, chunks) removed."""
+        cutoff = time.time() - days * 86400 if days else None
+        by_path = {}
+        for b in self.index["backups"]:
+            by_path.setdefault(b["path"], []).append(b)
+        kept = set()
+        for hist in by_path.values():
+            # Always keep the newest backup of each file, whatever its age
+            for i, b in enumerate(hist):
+                newest = len(hist) - i
+                if newest == 1 or (newest <= keep and (cutoff is None or b["time"] >= cutoff)):
+                    kept.add(b["id"])
+        removed = len(self.index["backups"]) - len(kept)
+        self.index["backups"] = [b for b in self.index["backups"] if b["id"] in kept]
+        self._save()
+
+        live = {c for b in self.index["backups"] for c in b["chunks"]}
+        swept = 0
+        objects = os.path.join(self.dir, "objects")
+        for sub in os.listdir(objects) if os.path.isdir(objects) else []:
+            for name in os.listdir(os.path.join(objects, sub)):
+                if sub + name not in live:
+                    os.unlink(os.path.join(objects, sub, name))
+                    swept += 1
+        return removed, swept
+
+    def disk_usage(self):
+        total = 0
+        for d, _, files in os.walk(self.dir):
+            total += sum(os.path.getsize(os.path.join(d, f)) for f in files)
+        return total
+
+
+def main(argv):
+    ap = argparse.ArgumentParser(description="RealmAgents backup store")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("list"); p.add_argument("root"); p.add_argument("path", nargs="?")
+    p = sub.add_parser("restore"); p.add_argument("root"); p.add_argument("target"); p.add_argument("--to")
+    p = sub.add_parser("prune"); p.add_argument("root"); p.add_argument("--keep", type=int, default=KEEP)
+    p.add_argument("--days", type=float)
+    p = sub.add_parser("adopt"); p.add_argument("root"); p.add_argument("--remove", action="store_true")
+    args = ap.parse_args(argv)
+    store = BackupStore(os.path.expanduser(args.root))
+
+    if args.cmd == "list":
+        rows = store.history(args.path) if args.path else store.index["backups"]
+        for b in rows:
+            when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(b["time"]))
+            print(f"{b['id']:>5}  {when}  {b['size']:>8}  {b['sha256'][:12]}  {b['path']}  {b['tag']}")
+        print(f"{len(rows)} backups, store size {store.disk_usage()} bytes")
+    elif args.cmd == "restore":
+        entry = store.find(args.target)
+        if not entry:
+            print(f"[ERROR] No backup matches {args.target}")
+            return 1
+        dest = store.restore(entry, args.to)
+        print(f"[OK] Restored backup {entry['id']} ({entry['path']}) -> {dest}")
+    elif args.cmd == "prune":
+        removed, swept = store.prune(args.keep, args.days)
+        print(f"[OK] Pruned {removed} backups, {swept} chunks; store size {store.disk_usage()} bytes")
+    elif args.cmd == "adopt":
+        # Only copies of the known generator outputs; oldest first, so the
+        # latest legacy copy becomes the newest backup
+        found = legacy_copies(store.root)
+        for legacy, original in found:
+            data = open(legacy, "rb").read()
+            # Store the copy under the original file's path, tagged with its old suffix
+            entry, created = store.backup_bytes(original, data, os.path.basename(legacy)[len(os.path.basename(original)) + 1:])
+            print(f"[OK] {store.rel(legacy)} -> backup {entry['id']}" + ("" if created else " (duplicate)"))
+            if args.remove:
+                os.unlink(legacy)
+        print(f"[DONE] Adopted {len(found)} legacy copies; store size {store.disk_usage()} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
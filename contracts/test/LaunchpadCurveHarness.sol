@@ -0,0 +1,34 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.24;
+
+import "../AgentLaunchpad.sol";
+
+/// @notice Exposes AgentLaunchpad's internal curve math to scripts/verify-curve.js.
+/// Verification only; not part of the deployment.
+contract LaunchpadCurveHarness is AgentLaunchpad {
+    constructor() AgentLaunchpad(address(1), address(1), address(1)) {}
+
+    function sqrt(uint256 x) external pure returns (uint256) {
+        return _sqrt(x);
+    }
+
+    function price(uint256 supply, uint256 basePrice, uint256 slope) external pure returns (uint256) {
+        return _currentPrice(supply, basePrice, slope);
+    }
+
+    function buy(uint256 supply, uint256 realmAmount, uint256 basePrice, uint256 slope) external pure returns (uint256) {
+        return _calculateBuyTokens(supply, realmAmount, basePrice, slope);
+    }
+
+    function sell(uint256 supply, uint256 tokenAmount, uint256 basePrice, uint256 slope) external pure returns (uint256) {
+        return _calculateSellReturn(supply, tokenAmount, basePrice, slope);
+    }
+
+    /// @notice Installs a launch with the given curve and token supply, so the
+    /// real quoteBuy / quoteSell can be called against it.
+    function setLaunch(uint256 agentId, uint256 supply, uint256 basePrice, uint256 slope) external {
+        AgentToken token = new AgentToken("Curve", "CURVE", address(this));
+        if (supply > 0) token.mint(address(this), supply);
+        launches[agentId] = LaunchInfo(address(token), agentId, 0, basePrice, slope, 0, block.timestamp, true);
+    }
+}
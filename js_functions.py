@@ -0,0 +1,171 @@
+"""
+Top-level function index for worker.js
+- Lightweight JS tokenizer: skips strings, template literals (with nested
+  ${...}), comments and regex literals so braces are matched correctly
+- Builds a name -> (start, end) span index of top-level function
+  declarations (including `async function`) in one pass
+- Looks up and replaces any number of functions by name without rescanning
+
+Usage:
+  index = FunctionIndex(code)
+  if "fetchGlobalMarket" in index:
+      code = index.replace({"fetchGlobalMarket": NEW_SOURCE})
+"""
+
+# After these tokens a "/" starts a regex literal rather than a division
+REGEX_PREFIX_PUNCT = set("(,=:[!&|?{};+-*%<>~^")
+REGEX_PREFIX_WORDS = {"return", "typeof", "case", "do", "else", "in", "of", "new",
+                      "delete", "void", "throw", "yield", "await", "instanceof"}
+# Tokens after which `function` is an expression, not a declaration
+EXPRESSION_PREFIX = set("=(,:?[.!&|+-") | {"return", "default"}
+
+
+def _is_ident(ch):
+    return ch.isalnum() or ch in "_$"
+
+
+class FunctionIndex:
+    def __init__(self, src):
+        self.src = src
+        self.spans = {}
+        self._scan()
+
+    def __contains__(self, name):
+        return name in self.spans
+
+    def __getitem__(self, name):
+        start, end = self.spans[name]
+        return self.src[start:end]
+
+    def replace(self, replacements):
+        """Return the source with each named function replaced by new text."""
+        missing = [n for n in replacements if n not in self.spans]
+        if missing:
+            raise KeyError(f"functions not found: {', '.join(missing)}")
+        parts, pos = [], 0
+        for name in sorted(replacements, key=lambda n: self.spans[n][0]):
+            start, end = self.spans[name]
+            parts.append(self.src[pos:start])
+            parts.append(replacements[name])
+            pos = end
+        parts.append(self.src[pos:])
+        return "".join(parts)
+
+    def _scan(self):
+        src, n = self.src, len(self.src)
+        i = 0
+        depth = paren = 0
+        # Stack of "{" (block) / "${" (template substitution) openers
+        stack = []
+        prev = None               # last significant token
+        prev_start = None         # start offset of `prev`
+        pending = None            # (name, start) awaiting its body "{"
+        body = None               # (name, start, depth) while inside a body
+
+        def template(i):
+            # Scan template text from i; stop after "`" or at "${"
+            while i < n:
+                ch = src[i]
+                if ch == "\\":
+                    i += 2
+                elif ch == "`":
+                    return i + 1, False
+                elif ch == "$" and src.startswith("${", i):
+                    return i + 2, True
+                else:
+                    i += 1
+            return n, False
+
+        while i < n:
+            ch = src[i]
+            if ch.isspace():
+                i += 1
+                continue
+            if src.startswith("//", i):
+                j = src.find("\n", i)
+                i = n if j < 0 else j + 1
+                continue
+            if src.startswith("/*", i):
+                j = src.find("*/", i + 2)
+                i = n if j < 0 else j + 2
+                continue
+
+            start = i
+            if ch in "'\"":
+                i += 1
+                while i < n and src[i] != ch:
+                    i += 2 if src[i] == "\\" else 1
+                i += 1
+                tok = "str"
+            elif ch == "`":
+                i, opened = template(i + 1)
+                if opened:
+                    stack.append("${")
+                tok = "str"
+            elif ch == "/" and (prev is None or prev in REGEX_PREFIX_PUNCT or prev in REGEX_PREFIX_WORDS):
+                i += 1
+                in_class = False
+                while i < n:
+                    c = src[i]
+                    if c == "\\":
+                        i += 2
+                        continue
+                    if c == "[":
+                        in_class = True
+                    elif c == "]":
+                        in_class = False
+                    elif c == "/" and not in_class:
+                        break
+                    elif c == "\n":
+                        break
+                    i += 1
+                i += 1
+                while i < n and _is_ident(src[i]):
+                    i += 1
+                tok = "regex"
+            elif _is_ident(ch):
+                while i < n and _is_ident(src[i]):
+                    i += 1
+                tok = src[start:i]
+            else:
+                i += 1
+                tok = ch
+                if ch == "(":
+                    paren += 1
+                elif ch == ")":
+                    paren -= 1
+                elif ch == "{":
+                    stack.append("{")
+                    if pending and depth == 0 and paren == 0:
+                        body = (pending[0], pending[1], depth)
+                        pending = None
+                    depth += 1
+                elif ch == "}":
+                    if stack and stack[-1] == "${":
+                        # End of a template substitution: resume the template
+                        stack.pop()
+                        i, opened = template(i)
+                        if opened:
+                            stack.append("${")
+                        tok = "str"
+                    else:
+                        if stack:
+                            stack.pop()
+                        depth -= 1
+                        if body and depth == body[2]:
+                            self.spans[body[0]] = (body[1], i)
+                            body = None
+
+            if tok == "function" and depth == 0 and not body and prev not in EXPRESSION_PREFIX:
+                fn_start = prev_start if prev == "async" else start
+                # Name follows, optionally after "*" (generators)
+                j = i
+                while j < n and (src[j].isspace() or src[j] == "*"):
+                    j += 1
+                k = j
+                while k < n and _is_ident(src[k]):
+                    k += 1
+                if k > j:
+                    pending = (src[j:k], fn_start)
+
+            prev, prev_start = tok, start
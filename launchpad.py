@@ -0,0 +1,343 @@
+"""
+AgentLaunchpad tooling (contracts/AgentLaunchpad.sol)
+- keccak256 (pure Python; hashlib's sha3_256 uses different padding)
+- Event signatures and their log topics, used by the worker's launchpad indexer
+- Bit-exact bonding-curve engine: _calculateBuyTokens / _calculateSellReturn /
+  _sqrt / _currentPrice with Solidity 0.8 checked arithmetic, so quotes need
+  no quoteBuy / quoteSell eth_call (the worker carries the same code in JS)
+- Launch state (getLaunch, token totalSupply, tradeFee) loaded once per block
+- verify: diffs local quotes against the deployed contract at one pinned block
+- vectors: edge-case + random inputs with expected outputs, consumed by
+  scripts/verify-curve.js (JS engine and Solidity harness)
+
+Usage:
+  python3 launchpad.py topics
+  python3 launchpad.py quote  AGENT_ID [--buy 1,10,100] [--sell 1000] [--rpc URL]
+  python3 launchpad.py verify AGENT_ID [AGENT_ID ...] [--rpc URL]
+  python3 launchpad.py vectors [--n 2000] [--seed 1] > vectors.json
+"""
+import argparse, json, os, random, sys, urllib.request
+from decimal import Decimal
+
+# Launchpad deployment on Base (same address as CONTRACTS.launchpad in the frontend)
+LAUNCHPAD_ADDRESS = "0x3b5Cb24E7cf42a8a4405968c81D257Ca71B6Aa10"
+
+EVENTS = {
+    "AgentLaunched": "AgentLaunched(uint256,address,address,uint256,uint256)",
+    "TokensBought": "TokensBought(uint256,address,uint256,uint256,uint256)",
+    "TokensSold": "TokensSold(uint256,address,uint256,uint256,uint256)",
+}
+
+# View functions read for local quoting (and for verify)
+FUNCTIONS = {
+    "getLaunch": "getLaunch(uint256)",
+    "tradeFee": "tradeFee()",
+    "totalSupply": "totalSupply()",
+    "quoteBuy": "quoteBuy(uint256,uint256)",
+    "quoteSell": "quoteSell(uint256,uint256)",
+}
+
+RPC_URL = os.environ.get("BASE_RPC_URL", "https://mainnet.base.org")
+
+# ─── keccak256 ────────────────────────────────────
+_RC = [
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A, 0x8000000080008000,
+    0x000000000000808B, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008A, 0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800A, 0x800000008000000A,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+]
+_ROT = [
+    [0, 36, 3, 41, 18], [1, 44, 10, 45, 2], [62, 6, 43, 15, 61],
+    [28, 55, 25, 21, 56], [27, 20, 39, 8, 14],
+]
+_M64 = (1 << 64) - 1
+
+
+def _rotl(v, n):
+    return ((v << n) | (v >> (64 - n))) & _M64 if n else v
+
+
+def _keccak_f(a):
+    for rc in _RC:
+        c = [a[x][0] ^ a[x][1] ^ a[x][2] ^ a[x][3] ^ a[x][4] for x in range(5)]
+        d = [c[(x - 1) % 5] ^ _rotl(c[(x + 1) % 5], 1) for x in range(5)]
+        a = [[a[x][y] ^ d[x] for y in range(5)] for x in range(5)]
+        b = [[0] * 5 for _ in range(5)]
+        for x in range(5):
+            for y in range(5):
+                b[y][(2 * x + 3 * y) % 5] = _rotl(a[x][y], _ROT[x][y])
+        a = [[b[x][y] ^ (~b[(x + 1) % 5][y] & b[(x + 2) % 5][y]) for y in range(5)] for x in range(5)]
+        a[0][0] ^= rc
+    return a
+
+
+def keccak256(data):
+    """Ethereum keccak-256 of bytes; returns 32 bytes."""
+    rate = 136
+    msg = bytearray(data) + b"\x01"
+    msg += b"\x00" * (-len(msg) % rate)
+    msg[-1] |= 0x80
+    a = [[0] * 5 for _ in range(5)]
+    for off in range(0, len(msg), rate):
+        block = msg[off:off + rate]
+        for i in range(rate // 8):
+            a[i % 5][i // 5] ^= int.from_bytes(block[i * 8:i * 8 + 8], "little")
+        a = _keccak_f(a)
+    return b"".join(a[i % 5][i // 5].to_bytes(8, "little") for i in range(4))
+
+
+def event_topic(signature):
+    return "0x" + keccak256(signature.encode()).hex()
+
+
+def selector(signature):
+    return "0x" + keccak256(signature.encode())[:4].hex()
+
+
+TOPICS = {name: event_topic(sig) for name, sig in EVENTS.items()}
+SELECTORS = {name: selector(sig) for name, sig in FUNCTIONS.items()}
+
+# ─── Bonding curve ────────────────────────────────
+# Mirrors AgentLaunchpad.sol operation by operation. Every step is checked like
+# Solidity 0.8 arithmetic: a result outside uint256 or a division by zero raises
+# Revert with the panic the EVM would return, so reverting inputs match too.
+WAD = 10 ** 18
+UINT256_MAX = (1 << 256) - 1
+PANIC_ARITHMETIC, PANIC_DIV_ZERO = "panic 0x11", "panic 0x12"
+
+
+class Revert(Exception):
+    """The call would revert on-chain; args[0] is the revert reason or panic."""
+
+
+def _u(v):
+    if v < 0 or v > UINT256_MAX:
+        raise Revert(PANIC_ARITHMETIC)
+    return v
+
+
+def _div(a, b):
+    if b == 0:
+        raise Revert(PANIC_DIV_ZERO)
+    return a // b
+
+
+def sol_sqrt(x):
+    if x == 0:
+        return 0
+    z = _div(_u(x + 1), 2)
+    y = x
+    while z < y:
+        y = z
+        z = _div(_u(_div(x, z) + z), 2)
+    return y
+
+
+def current_price(supply, base_price, slope):
+    return _u(base_price + _div(_u(slope * supply), WAD))
+
+
+def calculate_buy_tokens(supply, realm_amount, base_price, slope):
+    if slope == 0:
+        return _div(_u(realm_amount * WAD), base_price)
+    b = _u(base_price + _div(_u(slope * supply), WAD))
+    disc = _u(_u(b * b) + _u(_u(2 * slope) * realm_amount))
+    return _div(_u(_u(sol_sqrt(disc) - b) * WAD), slope)
+
+
+def calculate_sell_return(supply, token_amount, base_price, slope):
+    if token_amount > supply:
+        raise Revert("Launchpad: sell exceeds supply")
+    s1 = supply - token_amount
+    ds = supply - s1
+    linear = _div(_u(base_price * ds), WAD)
+    quad = _div(_u(_u(slope * _u(supply + s1)) * ds), 2 * 10 ** 36)
+    return _u(linear + quad)
+
+
+def quote_buy(launch, realm_amount, fee_bps):
+    """AgentLaunchpad.quoteBuy for a getLaunch() state with the token's supply."""
+    if int(launch["token"], 16) == 0:
+        raise Revert("Launchpad: not launched")
+    fee = _div(_u(realm_amount * fee_bps), 10000)
+    return calculate_buy_tokens(launch["supply"], _u(realm_amount - fee), launch["base_price"], launch["slope"])
+
+
+def quote_sell(launch, token_amount, fee_bps):
+    """AgentLaunchpad.quoteSell; gross above realm_reserve would still revert in sellTokens."""
+    if int(launch["token"], 16) == 0:
+        raise Revert("Launchpad: not launched")
+    gross = calculate_sell_return(launch["supply"], token_amount, launch["base_price"], launch["slope"])
+    return _u(gross - _div(_u(gross * fee_bps), 10000))
+
+
+# ─── Launch state ─────────────────────────────────
+def rpc_batch(url, calls):
+    """[(method, params)] as one JSON-RPC batch; returns results in call order."""
+    body = [{"jsonrpc": "2.0", "id": i, "method": m, "params": p} for i, (m, p) in enumerate(calls)]
+    req = urllib.request.Request(url, json.dumps(body).encode(), {"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=20) as r:
+        out = {x["id"]: x for x in json.load(r)}
+    return [out[i] for i in range(len(calls))]
+
+
+def _eth_call(to, data, block):
+    return "eth_call", [{"to": to, "data": data}, hex(block)]
+
+
+def _arg(*vals):
+    return "".join(f"{v:064x}" for v in vals)
+
+
+def _word(data, i):
+    return int(data[2 + i * 64:66 + i * 64], 16)
+
+
+def load_launches(agent_ids, url=RPC_URL, address=LAUNCHPAD_ADDRESS, block=None):
+    """State every quote for these agents needs, read at one block (latest by default)."""
+    if block is None:
+        block = int(rpc_batch(url, [("eth_blockNumber", [])])[0]["result"], 16)
+    calls = [_eth_call(address, SELECTORS["tradeFee"], block)]
+    calls += [_eth_call(address, SELECTORS["getLaunch"] + _arg(i), block) for i in agent_ids]
+    res = rpc_batch(url, calls)
+    if any("error" in r for r in res):
+        raise RuntimeError(next(r["error"]["message"] for r in res if "error" in r))
+    fee_bps, launches = int(res[0]["result"], 16), {}
+    for i, r in zip(agent_ids, res[1:]):
+        d = r["result"]
+        launches[i] = {"token": "0x" + f"{_word(d, 0):040x}", "agent_id": _word(d, 1), "realm_reserve": _word(d, 2),
+                       "base_price": _word(d, 3), "slope": _word(d, 4), "total_volume": _word(d, 5),
+                       "launched_at": _word(d, 6), "active": bool(_word(d, 7)), "supply": 0}
+    live = [i for i in agent_ids if int(launches[i]["token"], 16)]
+    if live:
+        res = rpc_batch(url, [_eth_call(launches[i]["token"], SELECTORS["totalSupply"], block) for i in live])
+        for i, r in zip(live, res):
+            launches[i]["supply"] = int(r["result"], 16)
+    return {"block": block, "fee_bps": fee_bps, "launches": launches}
+
+
+# ─── Differential vectors ─────────────────────────
+CURVE_FNS = {"sqrt": sol_sqrt, "price": current_price, "buy": calculate_buy_tokens, "sell": calculate_sell_return}
+DEFAULT_BASE_PRICE, DEFAULT_SLOPE = 10 ** 15, 10 ** 14  # defaultBasePrice / defaultSlope
+
+
+def _quote_fn(side):
+    def f(supply, amount, base_price, slope, fee_bps):
+        launch = {"token": "0x1", "supply": supply, "base_price": base_price, "slope": slope}
+        return (quote_buy if side == "buy" else quote_sell)(launch, amount, fee_bps)
+    return f
+
+
+CURVE_FNS.update(quoteBuy=_quote_fn("buy"), quoteSell=_quote_fn("sell"))
+
+
+def vector(fn, *args):
+    try:
+        out, err = str(CURVE_FNS[fn](*args)), None
+    except Revert as e:
+        out, err = None, e.args[0]
+    return {"fn": fn, "args": [str(a) for a in args], "out": out, "revert": err}
+
+
+def vectors(n=2000, seed=1):
+    """Edge cases (rounding, panics, require) plus n random cases per function."""
+    rng = random.Random(seed)
+    m, D, S = UINT256_MAX, DEFAULT_BASE_PRICE, DEFAULT_SLOPE
+    cases = [vector("sqrt", x) for x in (0, 1, 2, 3, 4, 15, 16, 17, (1 << 128) - 1, 1 << 128, m - 1, m)]
+    cases += [vector("price", *a) for a in ((0, D, S), (10 ** 24, D, S), (m // S + 1, D, S), (m, 0, 1), (1, m, WAD))]
+    cases += [vector("buy", *a) for a in (
+        (0, WAD, D, S), (0, 1, D, S), (10 ** 24, WAD, D, S), (0, WAD, D, 0), (0, WAD, 0, 0),
+        (0, m, D, S), (0, 1 << 160, 1 << 128, S), (m // S, WAD, D, S))]
+    cases += [vector("sell", *a) for a in (
+        (0, 0, D, S), (WAD, WAD, D, S), (WAD, WAD + 1, D, S), (10 ** 24, 1, D, S), (1 << 200, 1 << 199, D, S))]
+    cases += [vector(q, *a) for q in ("quoteBuy", "quoteSell") for a in (
+        (0, WAD, D, S, 200), (10 ** 24, 10 ** 21, D, S, 500), (0, 0, D, S, 200), (10 ** 22, 9999, D, S, 200))]
+
+    def num(bits):
+        return rng.getrandbits(rng.randint(0, bits))
+
+    for _ in range(n):
+        big = rng.random() < 0.1  # ~10% near the uint256 limits to exercise panics
+        supply = num(255 if big else 96)
+        base, slope = rng.choice([D, num(80), 0]), rng.choice([S, S, num(72), 0])
+        cases.append(vector("sqrt", num(256)))
+        cases.append(vector("price", supply, base, slope))
+        cases.append(vector("buy", supply, num(255 if big else 90), base, slope))
+        cases.append(vector("sell", supply, rng.choice([num(255 if big else 96), rng.randint(0, supply)]), base, slope))
+        fee = rng.choice([0, 200, 500, rng.randint(0, 500)])
+        cases.append(vector("quoteBuy", supply, num(90), base, slope, fee))
+        cases.append(vector("quoteSell", supply, rng.randint(0, supply), base, slope, fee))
+    return {"seed": seed, "n": n, "cases": cases}
+
+
+# ─── CLI ──────────────────────────────────────────
+def wad(text):
+    return int(Decimal(text) * WAD)
+
+
+def fmt(v):
+    return f"{Decimal(v) / WAD:f}"
+
+
+def main(argv):
+    ap = argparse.ArgumentParser(description="AgentLaunchpad topics, local quotes and curve verification")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("topics")
+    p = sub.add_parser("quote"); p.add_argument("agent", type=int); p.add_argument("--rpc", default=RPC_URL)
+    p.add_argument("--buy", default="1,10,100,1000,10000"); p.add_argument("--sell", default="")
+    p = sub.add_parser("verify"); p.add_argument("agents", type=int, nargs="+"); p.add_argument("--rpc", default=RPC_URL)
+    p = sub.add_parser("vectors"); p.add_argument("--n", type=int, default=2000); p.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "topics":
+        for name, sig in EVENTS.items():
+            print(f"{TOPICS[name]}  {sig}")
+        for name, sig in FUNCTIONS.items():
+            print(f"{SELECTORS[name]}  {sig}")
+    elif args.cmd == "vectors":
+        json.dump(vectors(args.n, args.seed), sys.stdout)
+        print()
+    elif args.cmd == "quote":
+        st = load_launches([args.agent], args.rpc)
+        l = st["launches"][args.agent]
+        print(f"agent {args.agent} @ block {st['block']}: supply {fmt(l['supply'])}, "
+              f"price {fmt(current_price(l['supply'], l['base_price'], l['slope']))} REALM, fee {st['fee_bps']} bps")
+        for side, amounts, fn in (("buy", args.buy, quote_buy), ("sell", args.sell, quote_sell)):
+            for a in filter(None, amounts.split(",")):
+                try:
+                    print(f"  {side:<4} {a:>12} -> {fmt(fn(l, wad(a), st['fee_bps']))}")
+                except Revert as e:
+                    print(f"  {side:<4} {a:>12} -> [REVERT] {e.args[0]}")
+    else:
+        # Local engine vs the contract's quoteBuy / quoteSell, both at the same block
+        st = load_launches(args.agents, args.rpc)
+        bad = total = 0
+        for i in args.agents:
+            l = st["launches"][i]
+            if not int(l["token"], 16):
+                print(f"[SKIP] agent {i}: not launched")
+                continue
+            ladder = [("quoteBuy", 10 ** k * WAD // 1000) for k in range(10)]
+            ladder += [("quoteSell", l["supply"] * k // 10) for k in range(1, 11)] + [("quoteSell", l["supply"] + 1)]
+            res = rpc_batch(args.rpc, [_eth_call(LAUNCHPAD_ADDRESS, SELECTORS[fn] + _arg(i, amt), st["block"])
+                                       for fn, amt in ladder])
+            for (fn, amt), r in zip(ladder, res):
+                total += 1
+                try:
+                    local = CURVE_FNS[fn](l["supply"], amt, l["base_price"], l["slope"], st["fee_bps"])
+                except Revert as e:
+                    local = e
+                chain = int(r["result"], 16) if "result" in r else None
+                if (chain is None) != isinstance(local, Revert) or (chain is not None and chain != local):
+                    bad += 1
+                    print(f"[ERROR] agent {i} {fn}({amt}): chain {chain if chain is not None else r['error']['message']}, local {local}")
+            print(f"[OK] agent {i}: {len(ladder)} quotes checked")
+        print(f"[{'DONE' if not bad else 'ERROR'}] {total - bad}/{total} quotes match the contract at block {st['block']}")
+        return 1 if bad else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,86 @@
+"""
+Single-pass multi-pattern patch engine
+- Compiles (old, new) rules into one Aho-Corasick automaton
+- Applies all rules in a single linear scan of the source
+- Overlaps resolve leftmost-longest, so the result does not depend on rule order
+- Reports per-rule hit counts
+
+Usage:
+  engine = PatchEngine([(old1, new1), (old2, new2)])
+  code, hits = engine.apply(code)   # hits[i] = replacements made by rule i
+"""
+from collections import deque
+
+
+class PatchEngine:
+    def __init__(self, rules):
+        self.rules = [(old, new) for old, new in rules]
+        seen = set()
+        for old, _ in self.rules:
+            if not old:
+                raise ValueError("patch rule with empty pattern")
+            if old in seen:
+                raise ValueError(f"duplicate patch pattern: {old[:50]!r}")
+            seen.add(old)
+
+        # Trie: goto[state] maps char -> state; out[state] is the rule id
+        # ending exactly at that state (patterns are unique, so at most one)
+        self.goto = [{}]
+        self.out = [-1]
+        for rid, (old, _) in enumerate(self.rules):
+            s = 0
+            for ch in old:
+                nxt = self.goto[s].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[s][ch] = nxt
+                    self.goto.append({})
+                    self.out.append(-1)
+                s = nxt
+            self.out[s] = rid
+
+        # Failure links (BFS) and dictionary links to the next state on the
+        # failure chain that ends a pattern
+        self.fail = [0] * len(self.goto)
+        self.dict_link = [-1] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            s = queue.popleft()
+            for ch, t in self.goto[s].items():
+                f = self.fail[s]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[t] = self.goto[f].get(ch, 0)
+                ft = self.fail[t]
+                self.dict_link[t] = ft if self.out[ft] >= 0 else self.dict_link[ft]
+                queue.append(t)
+
+    def matches(self, text):
+        """Yield (start, rule_id) for every occurrence of every pattern."""
+        goto, fail, out, dict_link, rules = self.goto, self.fail, self.out, self.dict_link, self.rules
+        s = 0
+        for i, ch in enumerate(text):
+            while s and ch not in goto[s]:
+                s = fail[s]
+            s = goto[s].get(ch, 0)
+            t = s if out[s] >= 0 else dict_link[s]
+            while t > 0:
+                rid = out[t]
+                yield i - len(rules[rid][0]) + 1, rid
+                t = dict_link[t]
+
+    def apply(self, text):
+        """Return (patched_text, hits) with leftmost-longest, non-overlapping replacement."""
+        found = sorted(self.matches(text), key=lambda m: (m[0], -len(self.rules[m[1]][0])))
+        hits = [0] * len(self.rules)
+        parts, pos = [], 0
+        for start, rid in found:
+            if start < pos:
+                continue
+            old, new = self.rules[rid]
+            parts.append(text[pos:start])
+            parts.append(new)
+            pos = start + len(old)
+            hits[rid] += 1
+        parts.append(text[pos:])
+        return "".join(parts), hits
@@ -0,0 +1,130 @@
+"""
+RealmAgents fleet patch runner
+- Applies a patch set (fix_agents_v2, fix_v2_patch, rebuild_site, ...) to many
+  checkouts in parallel with a process pool
+- Each target runs its scripts in order inside one worker process, with
+  REALMAGENTS_ROOT pointing at the checkout (no interpreter start per script)
+- A target stops at its first failing script; other targets keep going
+- Prints per-target timing and outcome; writes a JSON summary with --json
+
+Usage:
+  python3 patch_fleet.py [--set worker|site|full|a.py,b.py] [-j N] [--json out.json] ROOT_OR_GLOB...
+  python3 patch_fleet.py --set full --json fleet.json "~/deployments/*"
+"""
+import argparse, contextlib, glob, io, json, os, runpy, sys, time, traceback
+from concurrent.futures import ProcessPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Scripts run in list order; later scripts expect earlier ones' output
+PATCH_SETS = {
+    "worker": ["fix_agents_v2.py", "fix_v2_patch.py"],
+    "site": ["rebuild_site.py"],
+    "full": ["rebuild_site.py", "fix_agents_v2.py", "fix_v2_patch.py"],
+}
+
+
+def run_script(script):
+    """Run one patch script in-process; returns (ok, captured_output)."""
+    out = io.StringIO()
+    ok = True
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(out):
+        try:
+            runpy.run_path(os.path.join(HERE, script), run_name="__main__")
+        except SystemExit as e:
+            ok = e.code in (None, 0)
+        except Exception:
+            traceback.print_exc()
+            ok = False
+    return ok, out.getvalue()
+
+
+def run_target(root, scripts):
+    if HERE not in sys.path:
+        sys.path.insert(0, HERE)
+    os.environ["REALMAGENTS_ROOT"] = root
+    result = {"root": root, "ok": True, "seconds": 0.0, "scripts": []}
+    t0 = time.perf_counter()
+    for script in scripts:
+        t = time.perf_counter()
+        ok, output = run_script(script)
+        lines = output.strip().splitlines()
+        result["scripts"].append({
+            "script": script, "ok": ok, "seconds": round(time.perf_counter() - t, 3),
+            "warnings": [l for l in lines if l.startswith(("[WARN]", "[SKIP]", "[ERROR]"))],
+            "last": lines[-1] if lines else "",
+        })
+        if not ok:
+            result["ok"] = False
+            break
+    result["seconds"] = round(time.perf_counter() - t0, 3)
+    return result
+
+
+def expand_targets(patterns):
+    roots = []
+    for p in patterns:
+        matches = sorted(glob.glob(os.path.expanduser(p))) or [os.path.expanduser(p)]
+        for m in matches:
+            m = os.path.abspath(m)
+            if os.path.isdir(m) and m not in roots:
+                roots.append(m)
+            elif not os.path.isdir(m):
+                print(f"[SKIP] Not a directory: {m}", file=sys.stderr)
+    return roots
+
+
+def main(argv):
+    ap = argparse.ArgumentParser(description="Apply a patch set to many RealmAgents checkouts")
+    ap.add_argument("targets", nargs="+", help="checkout roots or globs")
+    ap.add_argument("--set", default="worker",
+                    help=f"patch set ({', '.join(PATCH_SETS)}) or comma-separated script list")
+    ap.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--json", help="write machine-readable summary here ('-' for stdout)")
+    args = ap.parse_args(argv)
+
+    # Keep stdout clean for the JSON summary when it goes there
+    out = sys.stderr if args.json == "-" else sys.stdout
+    log = lambda *a: print(*a, file=out)
+
+    scripts = PATCH_SETS.get(args.set) or [s.strip() for s in args.set.split(",") if s.strip()]
+    for s in scripts:
+        if not os.path.exists(os.path.join(HERE, s)):
+            log(f"[ERROR] Unknown script: {s}")
+            return 2
+    roots = expand_targets(args.targets)
+    if not roots:
+        log("[ERROR] No target directories")
+        return 2
+
+    log(f"Patching {len(roots)} targets with {', '.join(scripts)} ({args.jobs} workers)")
+    t0 = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=min(args.jobs, len(roots))) as pool:
+        for r in pool.map(run_target, roots, [scripts] * len(roots)):
+            results.append(r)
+            steps = ", ".join(f"{s['script']} {s['seconds']:.2f}s" for s in r["scripts"])
+            log(f"{'[OK]' if r['ok'] else '[FAIL]'} {r['root']}  {r['seconds']:.2f}s  ({steps})")
+            if not r["ok"]:
+                log(f"  {r['scripts'][-1]['last']}")
+    elapsed = time.perf_counter() - t0
+
+    failed = sum(not r["ok"] for r in results)
+    log()
+    log(f"[DONE] {len(results) - failed}/{len(results)} targets patched in {elapsed:.2f}s")
+
+    if args.json:
+        summary = {"set": scripts, "jobs": args.jobs, "seconds": round(elapsed, 3),
+                   "ok": len(results) - failed, "failed": failed, "targets": results}
+        text = json.dumps(summary, indent=2)
+        if args.json == "-":
+            print(text)
+        else:
+            with open(args.json, "w") as f:
+                f.write(text + "\n")
+            log(f"[OK] Summary: {args.json}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -2,19 +2,23 @@
 RealmAgents Unified Site Rebuild
 Rewrites App.jsx from scratch as a single unified app.
 Cleans index.html and updates favicon.
+Files are only rewritten (atomically) when their content changes; see artifacts.py.
 """
-import os, re, shutil
+import os, re
+from artifacts import Manifest
+from backup_store import BackupStore
 
-BASE = os.path.expanduser("~/realmagents/frontend")
+ROOT = os.environ.get("REALMAGENTS_ROOT") or os.path.expanduser("~/realmagents")
+BASE = os.path.join(ROOT, "frontend")
+manifest = Manifest(ROOT)
 
 # ═══════════════════════════════════════════════════
 # BACKUP
 # ═══════════════════════════════════════════════════
 src = os.path.join(BASE, "src", "App.jsx")
-bak = os.path.join(BASE, "src", "App.jsx.pre-rebuild")
 if os.path.exists(src):
-    shutil.copy2(src, bak)
-    print(f"[OK] Backup: {bak}")
+    entry, created = BackupStore(ROOT).backup(src, "pre-rebuild")
+    print(f"[OK] Backup: App.jsx -> backup {entry['id']}" + ("" if created else " (unchanged)"))
 
 # ═══════════════════════════════════════════════════
 # 1. NEW App.jsx
@@ -154,11 +158,9 @@ function Agents() {
   const load = async () => {
     setLoading(true);
     try {
-      const [y, s, w] = await Promise.all([
-        fetch(`${API}/api/agents/0/data`).then(r => r.json()),
-        fetch(`${API}/api/agents/1/data`).then(r => r.json()),
-        fetch(`${API}/api/agents/2/data`).then(r => r.json()),
-      ]);
+      // One request for the three agents shown here, projected to the fields rendered
+      const d = await fetch(`${API}/api/dashboard?ids=0,1,2&fields=summary,opportunities,topCoins,transfers,error`).then(r => r.json());
+      const [y, s, w] = d.agents;
       setYield(y); setSentiment(s); setWhale(w);
       setLastUpdate(new Date().toLocaleTimeString());
     } catch (e) { console.error("Agent data failed:", e); }
@@ -478,9 +480,10 @@ export default function App() {
 }
 '''
 
-with open(src, "w") as f:
-    f.write(APP_JSX)
-print(f"[OK] Wrote new App.jsx ({len(APP_JSX)} chars, {APP_JSX.count(chr(10))} lines)")
+if manifest.write(src, APP_JSX):
+    print(f"[OK] Wrote new App.jsx ({len(APP_JSX)} chars, {APP_JSX.count(chr(10))} lines)")
+else:
+    print("[SKIP] App.jsx unchanged")
 
 
 # ═══════════════════════════════════════════════════
@@ -495,9 +498,10 @@ html = re.sub(r'(<script type="module"[^>]*>[^<]*</script>).*?(</body>)', r'\1\n
 # Update favicon
 html = re.sub(r'href="/favicon\.svg[^"]*"', 'href="/favicon.svg?v=5"', html)
 
-with open(idx_path, "w") as f:
-    f.write(html)
-print("[OK] Cleaned index.html (removed all injections, updated favicon)")
+if manifest.write(idx_path, html):
+    print("[OK] Cleaned index.html (removed all injections, updated favicon)")
+else:
+    print("[SKIP] index.html unchanged")
 
 
 # ═══════════════════════════════════════════════════
@@ -509,9 +513,10 @@ FAV = '''<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 512 512">
 <circle cx="256" cy="256" r="248" fill="#0a0a0f"/><circle cx="256" cy="256" r="248" fill="none" stroke="url(#g)" stroke-width="6"/>
 <text x="256" y="310" text-anchor="middle" font-family="Arial,Helvetica,sans-serif" font-size="220" font-weight="900" fill="url(#g)">R</text>
 </svg>'''
-with open(fav_path, "w") as f:
-    f.write(FAV)
-print("[OK] Updated favicon.svg (DAO logo)")
+if manifest.write(fav_path, FAV):
+    print("[OK] Updated favicon.svg (DAO logo)")
+else:
+    print("[SKIP] favicon.svg unchanged")
 
 
 # ═══════════════════════════════════════════════════
@@ -519,14 +524,18 @@ print("[OK] Updated favicon.svg (DAO logo)")
 # ═══════════════════════════════════════════════════
 agents_path = os.path.join(BASE, "public", "agents.html")
 if os.path.exists(agents_path):
-    with open(agents_path, "w") as f:
-        f.write('<!DOCTYPE html><html><head><meta http-equiv="refresh" content="0;url=/"></head><body>Redirecting...</body></html>')
-    print("[OK] agents.html now redirects to / (unified site)")
+    if manifest.write(agents_path, '<!DOCTYPE html><html><head><meta http-equiv="refresh" content="0;url=/"></head><body>Redirecting...</body></html>'):
+        print("[OK] agents.html now redirects to / (unified site)")
+
+manifest.save()
 
 print()
 print("=" * 50)
 print("REBUILD COMPLETE!")
 print("=" * 50)
 print()
-print("Now run:")
-print("  cd ~/realmagents/frontend && npm run build && npx wrangler pages deploy dist")
+if manifest.stale("frontend"):
+    print("Now run:")
+    print("  cd ~/realmagents/frontend && npm run build && npx wrangler pages deploy dist && python3 artifacts.py stamp ~/realmagents frontend")
+else:
+    print("Frontend unchanged since last build; nothing to deploy.")
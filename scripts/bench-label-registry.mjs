@@ -0,0 +1,68 @@
+/**
+ * Benchmark: RLB1 address label registry vs a plain object table
+ *
+ * Reports memory and per-lookup cost of the compiled registry, read with the
+ * worker's own parseLabelRegistry/registryLabel (loaded from
+ * agents-api/worker.template.js), against the equivalent { address: label }
+ * object.
+ *
+ * Usage:
+ *   python3 address_labels.py synth 100000 /tmp/labels-100k.csv
+ *   python3 address_labels.py compile /tmp/labels-100k.csv -o /tmp/labels-100k.bin
+ *   node --expose-gc scripts/bench-label-registry.mjs /tmp/labels-100k.bin
+ */
+import { readFileSync } from "node:fs";
+
+const file = process.argv[2];
+if (!file) { console.error("usage: node --expose-gc scripts/bench-label-registry.mjs <labels.bin>"); process.exit(1); }
+const gc = globalThis.gc || (() => {});
+const mem = () => { gc(); gc(); const m = process.memoryUsage(); return m.heapUsed + m.arrayBuffers; };
+const mb = (b) => (b / 1048576).toFixed(2) + " MB";
+
+// ─── Reader: parseLabelRegistry / registryLabel from the worker template ───
+const src = readFileSync(new URL("../agents-api/worker.template.js", import.meta.url), "utf8");
+const start = src.indexOf("// ─── Known Address Labels");
+const end = src.indexOf("\n// ───", start + 1);
+if (start < 0 || end < 0) throw new Error("Known Address Labels section not found in worker.template.js");
+const { parseLabelRegistry, registryLabel, useRegistry } = new Function(
+  src.slice(start, end).replace("__KNOWN_LABELS__", "{}") +
+  "\nreturn { parseLabelRegistry, registryLabel, useRegistry: (r) => { labelRegistry = r; } };")();
+
+// ─── Load ─────────────────────────────────────────
+const raw = readFileSync(file);
+const m0 = mem();
+const buf = raw.buffer.slice(raw.byteOffset, raw.byteOffset + raw.byteLength);
+let t0 = performance.now();
+const R = parseLabelRegistry(buf);
+useRegistry(R);
+const parseMs = performance.now() - t0;
+const regBytes = mem() - m0;
+
+const m1 = mem();
+const hex = (i) => "0x" + Array.from(R.u8.subarray(R.addrs + i * 20, R.addrs + i * 20 + 20), b => b.toString(16).padStart(2, "0")).join("");
+const addrs = Array.from({ length: R.count }, (_, i) => hex(i));
+t0 = performance.now();
+const table = {};
+for (let i = 0; i < R.count; i++) table[addrs[i]] = registryLabel(addrs[i]);
+const buildMs = performance.now() - t0;
+const objBytes = mem() - m1;
+
+// ─── Lookups: 50% hits, 50% misses ─────────────────
+const probes = addrs.slice(0, 100000).flatMap(a => [a, "0x" + a.slice(2).split("").reverse().join("")]);
+function time(fn) {
+  for (let i = 0; i < 2; i++) for (const a of probes) fn(a);
+  const t = performance.now();
+  let hits = 0;
+  for (let r = 0; r < 5; r++) for (const a of probes) if (fn(a)) hits++;
+  return { ns: (performance.now() - t) * 1e6 / (probes.length * 5), hits };
+}
+const reg = time(a => registryLabel(a));
+const obj = time(a => table[a] || null);
+
+console.log(`Label registry benchmark: ${R.count.toLocaleString()} labels, ${file}`);
+console.log(`  blob size      ${mb(buf.byteLength)}  (parse ${parseMs.toFixed(2)} ms)`);
+console.log(`  RLB1 memory    ${mb(regBytes)}`);
+console.log(`  object memory  ${mb(objBytes)}  (incl. key strings; build ${buildMs.toFixed(0)} ms)`);
+console.log(`  RLB1 lookup    ${reg.ns.toFixed(0)} ns`);
+console.log(`  object lookup  ${obj.ns.toFixed(0)} ns`);
+if (reg.hits !== obj.hits) { console.error("[ERROR] hit counts differ", reg.hits, obj.hits); process.exit(1); }
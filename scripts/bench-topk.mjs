@@ -0,0 +1,54 @@
+/**
+ * Benchmark: bounded top-K heap vs sort-and-slice
+ *
+ * Runs both ranking strategies used by the generated worker (top 20 pools by
+ * APY, latest 30 whale transfers by block) at 10k, 100k and 1M items and
+ * checks they return the same items in the same order. TopK is taken from
+ * agents-api/worker.template.js, so the benchmark runs the shipped code.
+ *
+ * Usage:
+ *   node scripts/bench-topk.mjs [sizes=10000,100000,1000000]
+ */
+
+import { readFileSync } from "fs";
+
+const SIZES = (process.argv[2] || "10000,100000,1000000").split(",").map(Number);
+
+// ─── TopK: the worker's "Top-K selection" fragment, evaluated standalone ───
+const src = readFileSync(new URL("../agents-api/worker.template.js", import.meta.url), "utf8");
+const start = src.indexOf("// ─── Top-K selection");
+const end = src.indexOf("\n// ───", start + 1);
+if (start < 0 || end < 0) throw new Error("Top-K selection section not found in worker.template.js");
+const TopK = new Function(src.slice(start, end) + "\nreturn TopK;")();
+
+let seed = 7;
+const rand = () => (seed = (seed * 1103515245 + 12345) & 0x7fffffff) / 0x7fffffff;
+
+function time(fn, rounds) {
+  fn();
+  const t = performance.now();
+  let out;
+  for (let i = 0; i < rounds; i++) out = fn();
+  return { ms: (performance.now() - t) / rounds, out };
+}
+
+const cases = [
+  { name: "pools by apy", k: 20, make: (n) => Array.from({ length: n }, (_, i) => ({ id: i, apy: Math.round(rand() * 100000) / 100 })), key: "apy" },
+  { name: "transfers by block", k: 30, make: (n) => Array.from({ length: n }, (_, i) => ({ id: i, blockNumber: 1000000 + Math.floor(rand() * n) })), key: "blockNumber" },
+];
+
+console.log("case                      n      sort+slice     top-K   speedup");
+for (const c of cases) {
+  for (const n of SIZES) {
+    const items = c.make(n);
+    const rounds = n >= 1000000 ? 3 : n >= 100000 ? 10 : 50;
+    // sort() works in place, so copy first (the worker sorted a fresh filter() result)
+    const a = time(() => items.slice().sort((x, y) => y[c.key] - x[c.key]).slice(0, c.k), rounds);
+    const b = time(() => TopK.of(items, c.k, x => x[c.key]), rounds);
+    if (a.out.map(x => x.id).join() !== b.out.map(x => x.id).join()) {
+      console.error(`[ERROR] ${c.name} n=${n}: results differ`);
+      process.exit(1);
+    }
+    console.log(`${c.name.padEnd(20)} ${String(n).padStart(8)} ${a.ms.toFixed(2).padStart(11)} ms ${b.ms.toFixed(2).padStart(8)} ms ${(a.ms / b.ms).toFixed(1).padStart(8)}x`);
+  }
+}
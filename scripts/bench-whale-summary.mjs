@@ -0,0 +1,87 @@
+/**
+ * Micro-benchmark: whale transfer labeling + summary statistics
+ *
+ * Compares the original worker path (KNOWN[a.toLowerCase()] per lookup, then
+ * four filter/regex passes over the transfers) against the precomputed
+ * address index + single-pass whaleSummary, both taken from
+ * agents-api/worker.template.js with the built-in labels from labels.csv.
+ *
+ * Usage:
+ *   node scripts/bench-whale-summary.mjs [transfers=50000] [rounds=20]
+ */
+
+import { readFileSync } from "fs";
+
+const N = parseInt(process.argv[2] || "50000");
+const ROUNDS = parseInt(process.argv[3] || "20");
+
+// ─── Worker code: labels from labels.csv, index + summary from the template ───
+const read = (rel) => readFileSync(new URL(rel, import.meta.url), "utf8");
+const KNOWN = Object.fromEntries(read("../agents-api/labels.csv").trim().split("\n").slice(1).map(line => {
+  const i = line.indexOf(",");
+  return [line.slice(0, i).trim().toLowerCase(), line.slice(i + 1).trim()];
+}));
+const src = read("../agents-api/worker.template.js");
+function section(name) {
+  const start = src.indexOf(`// ─── ${name}`);
+  const end = src.indexOf("\n// ───", start + 1);
+  if (start < 0 || end < 0) throw new Error(`${name} section not found in worker.template.js`);
+  return src.slice(start, end);
+}
+const { labelLc, whaleSummary } = new Function(
+  section("Known Address Labels").replace("__KNOWN_LABELS__", JSON.stringify(KNOWN)) + "\n" +
+  section("Whale Summary") + "\nreturn { labelLc, whaleSummary };")();
+
+// ─── Synthetic logs ────────────────────────────────
+// ~1 in 8 endpoints is a known address, the rest are random wallets.
+let seed = 42;
+const rand = () => (seed = (seed * 1103515245 + 12345) & 0x7fffffff) / 0x7fffffff;
+const known = Object.keys(KNOWN);
+const wallet = () => rand() < 0.125
+  ? known[Math.floor(rand() * known.length)]
+  : "0x" + Array.from({ length: 40 }, () => "0123456789abcdef"[Math.floor(rand() * 16)]).join("");
+const logs = Array.from({ length: N }, (_, i) => ({
+  asset: rand() < 0.5 ? "REALM" : "WETH", from: wallet(), to: wallet(),
+  amount: Math.round(rand() * 10000), blockNumber: 1000000 + i,
+}));
+
+// ─── Original: per-lookup lowercasing + multi-pass regex ───
+function baseline(logs) {
+  const label = (a) => KNOWN[a.toLowerCase()] || null;
+  const transfers = logs.map(l => ({ ...l, fromLabel: label(l.from), toLabel: label(l.to) }));
+  const realm = transfers.filter(t => t.asset === "REALM"), weth = transfers.filter(t => t.asset === "WETH");
+  const volR = realm.reduce((s, t) => s + t.amount, 0), volW = weth.reduce((s, t) => s + t.amount, 0);
+  const uniq = new Set([...transfers.map(t => t.from), ...transfers.map(t => t.to)]).size;
+  const labeled = transfers.filter(t => t.fromLabel || t.toLabel).length;
+  const exFlows = transfers.filter(t => (t.fromLabel || "").match(/Binance|Coinbase|Gate|Kraken|KuCoin/i) || (t.toLabel || "").match(/Binance|Coinbase|Gate|Kraken|KuCoin/i));
+  const toEx = exFlows.filter(t => (t.toLabel || "").match(/Binance|Coinbase|Gate|Kraken|KuCoin/i)).length;
+  const fromEx = exFlows.filter(t => (t.fromLabel || "").match(/Binance|Coinbase|Gate|Kraken|KuCoin/i)).length;
+  return { realm: realm.length, weth: weth.length, volR, volW, uniq, labeled, exFlows: exFlows.length, toEx, fromEx };
+}
+
+// ─── Indexed: the worker's address index + single-pass whaleSummary ───
+function indexed(logs) {
+  const rows = logs.map(l => ({ ...l, fromLabel: labelLc(l.from), toLabel: labelLc(l.to) }));
+  const { byAsset: { REALM, WETH }, uniq, labeled, exFlows, toEx, fromEx } = whaleSummary(rows, ["REALM", "WETH"]);
+  return { realm: REALM.transfers, weth: WETH.transfers, volR: REALM.volume, volW: WETH.volume, uniq, labeled, exFlows, toEx, fromEx };
+}
+
+// ─── Run ───────────────────────────────────────────
+function bench(name, fn) {
+  for (let i = 0; i < 3; i++) fn(logs); // warm-up
+  const t0 = performance.now();
+  let out;
+  for (let i = 0; i < ROUNDS; i++) out = fn(logs);
+  const ms = (performance.now() - t0) / ROUNDS;
+  console.log(`${name.padEnd(10)} ${ms.toFixed(2).padStart(8)} ms/round`);
+  return { ms, out };
+}
+
+console.log(`Whale summary benchmark: ${N.toLocaleString()} transfers, ${ROUNDS} rounds`);
+const a = bench("baseline", baseline);
+const b = bench("indexed", indexed);
+if (JSON.stringify(a.out) !== JSON.stringify(b.out)) {
+  console.error("[ERROR] results differ", a.out, b.out);
+  process.exit(1);
+}
+console.log(`speedup    ${(a.ms / b.ms).toFixed(2)}x (identical summaries)`);
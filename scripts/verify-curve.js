@@ -0,0 +1,103 @@
+/**
+ * Differential check of the bonding-curve engines against AgentLaunchpad.sol
+ *
+ * launchpad.py generates edge-case + random vectors with the Python engine's
+ * outputs and revert reasons. The worker's "Bonding Curve" fragment is taken
+ * from agents-api/worker.template.js and run on the same inputs. Under hardhat,
+ * contracts/test/LaunchpadCurveHarness.sol (the contract's own _sqrt,
+ * _currentPrice, _calculateBuyTokens, _calculateSellReturn, quoteBuy,
+ * quoteSell) is deployed on the in-process network and checked as well.
+ *
+ * Usage:
+ *   node scripts/verify-curve.js [n=2000] [seed=1]                     # Python vs JS
+ *   CURVE_N=500 CURVE_SEED=7 npx hardhat run scripts/verify-curve.js   # + Solidity
+ */
+const { execFileSync } = require("child_process");
+const fs = require("fs");
+const path = require("path");
+
+const ROOT = path.join(__dirname, "..");
+const N = process.env.CURVE_N || process.argv[2] || "2000";
+const SEED = process.env.CURVE_SEED || process.argv[3] || "1";
+
+// ─── JS engine: the worker fragment, evaluated standalone ───
+function loadWorkerCurve() {
+  const src = fs.readFileSync(path.join(ROOT, "agents-api", "worker.template.js"), "utf8");
+  const start = src.indexOf("// ─── Bonding Curve");
+  const end = src.indexOf("\n// ───", start + 1);
+  if (start < 0 || end < 0) throw new Error("Bonding Curve section not found in worker.template.js");
+  return new Function(src.slice(start, end) +
+    "\nreturn { curveSqrt, curvePrice, curveBuyTokens, curveSellReturn, quoteBuy, quoteSell, CurveRevert };")();
+}
+
+function runJs(js, fn, a) {
+  const q = () => ({ supply:a[0], basePrice:a[2], slope:a[3], feeBps:a[4] });
+  switch (fn) {
+    case "sqrt": return js.curveSqrt(a[0]);
+    case "price": return js.curvePrice(...a);
+    case "buy": return js.curveBuyTokens(...a);
+    case "sell": return js.curveSellReturn(...a);
+    case "quoteBuy": return js.quoteBuy(q(), a[1]);
+    case "quoteSell": return js.quoteSell(q(), a[1]);
+  }
+}
+
+// ─── Solidity: harness on the hardhat network ───
+function revertReason(e) {
+  const r = e.revert;
+  if (r?.name === "Panic") return "panic 0x" + r.args[0].toString(16);
+  if (r?.name === "Error") return r.args[0];
+  return e.shortMessage || e.message;
+}
+
+async function solidityRunner(hre) {
+  const h = await (await hre.ethers.getContractFactory("LaunchpadCurveHarness")).deploy();
+  await h.waitForDeployment();
+  let nextId = 1n, fee = 200n;
+  return async (fn, a) => {
+    if (fn === "quoteBuy" || fn === "quoteSell") {
+      if (a[4] !== fee) { await (await h.setTradeFee(a[4])).wait(); fee = a[4]; }
+      const id = nextId++;
+      await (await h.setLaunch(id, a[0], a[2], a[3])).wait();
+      return h[fn].staticCall(id, a[1]);
+    }
+    return h[fn].staticCall(...a);
+  };
+}
+
+async function check(name, cases, run) {
+  let bad = 0;
+  for (const c of cases) {
+    const args = c.args.map(BigInt);
+    let out, revert;
+    try { out = (await run(c.fn, args)).toString(); } catch (e) { revert = revertReason(e); }
+    if (out !== (c.out ?? undefined) || (c.revert && revert !== c.revert)) {
+      if (++bad <= 10) console.log(`[ERROR] ${name} ${c.fn}(${c.args.join(", ")}): expected ${c.out ?? "revert " + c.revert}, got ${out ?? "revert " + revert}`);
+    }
+  }
+  console.log(`[${bad ? "ERROR" : "OK"}] ${name}: ${cases.length - bad}/${cases.length} cases match the Python engine`);
+  return bad;
+}
+
+async function main() {
+  const vectors = JSON.parse(execFileSync("python3", [path.join(ROOT, "launchpad.py"), "vectors", "--n", N, "--seed", SEED],
+    { maxBuffer: 1 << 28 }).toString());
+  const reverts = vectors.cases.filter(c => c.revert).length;
+  console.log(`${vectors.cases.length} vectors (seed ${vectors.seed}, ${reverts} reverting)`);
+
+  const js = loadWorkerCurve();
+  let bad = await check("worker JS", vectors.cases, async (fn, a) => {
+    try { return runJs(js, fn, a); } catch (e) { if (e instanceof js.CurveRevert) throw { message:e.message }; throw e; }
+  });
+
+  if (process.env.HARDHAT_NETWORK) {
+    const hre = require("hardhat");
+    bad += await check("Solidity", vectors.cases, await solidityRunner(hre));
+  } else {
+    console.log("[SKIP] Solidity: run under `npx hardhat run` to include the contract");
+  }
+  console.log(bad ? `[ERROR] ${bad} mismatches` : "[DONE] All engines agree");
+  process.exitCode = bad ? 1 : 0;
+}
+
+main().catch(e => { console.error(e); process.exit(1); });
@@ -0,0 +1,48 @@
+/**
+ * Differential check of sentiment.py against the worker's sentimentScore
+ *
+ * sentiment.py generates random + edge-case inputs (Fear & Greed, per-coin 24h
+ * changes, market-cap change) with its NumPy outputs. The worker's
+ * sentimentScore is taken from agents-api/worker.template.js, run with the
+ * same weights, and every field must match exactly (no tolerance), so scores
+ * backfilled offline are the ones the worker would have served.
+ *
+ * Usage:
+ *   node scripts/verify-sentiment.js [n=2000] [seed=1]
+ */
+const { execFileSync } = require("child_process");
+const fs = require("fs");
+const path = require("path");
+
+const ROOT = path.join(__dirname, "..");
+const N = process.argv[2] || "2000";
+const SEED = process.argv[3] || "1";
+
+function loadWorkerScore(weights) {
+  const src = fs.readFileSync(path.join(ROOT, "agents-api", "worker.template.js"), "utf8");
+  const start = src.indexOf("function sentimentScore(");
+  const end = src.indexOf("\n}\n", start);
+  if (start < 0 || end < 0) throw new Error("sentimentScore not found in worker.template.js");
+  return new Function("SENTIMENT_WEIGHTS", src.slice(start, end + 3) + "\nreturn sentimentScore;")(weights);
+}
+
+function main() {
+  const vectors = JSON.parse(execFileSync("python3", [path.join(ROOT, "sentiment.py"), "vectors", "--n", N, "--seed", SEED],
+    { maxBuffer: 1 << 28 }).toString());
+  console.log(`${vectors.vectors.length} vectors (seed ${vectors.seed}, weights ${JSON.stringify(vectors.weights)})`);
+
+  const sentimentScore = loadWorkerScore(vectors.weights);
+  let bad = 0;
+  for (const v of vectors.vectors) {
+    const js = sentimentScore(v.fg, v.changes, v.mcap);
+    const diff = ["score", "momentum", "market", "avgChange"].filter(k => !Object.is(js[k], v[k]));
+    if (diff.length && ++bad <= 10) {
+      console.log(`[ERROR] fg=${v.fg} changes=[${v.changes}] mcap=${v.mcap}: ` +
+        diff.map(k => `${k} python ${v[k]} js ${js[k]}`).join(", "));
+    }
+  }
+  console.log(bad ? `[ERROR] ${bad}/${vectors.vectors.length} mismatches` : `[DONE] ${vectors.vectors.length}/${vectors.vectors.length} match the worker`);
+  process.exitCode = bad ? 1 : 0;
+}
+
+main();
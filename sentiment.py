@@ -0,0 +1,284 @@
+"""
+Sentiment scoring engine: the worker's sentimentScore over arrays of history
+- score(): Fear & Greed, price momentum (mean and breadth of the coins' 24h
+  changes) and the market-cap trend, weighted and clamped exactly like the
+  Sentiment Analyzer; float64 throughout with the coin sum taken in the JS
+  reduce order, so every day's score equals the worker's to the bit
+- Weights are parameters (defaults: worker_template.SENTIMENT_WEIGHTS, the
+  ones the worker is generated with)
+- Historical inputs: Fear & Greed from alternative.me (full daily history),
+  daily closes of the worker's LLAMA_COINS from DeFiLlama. No free source has
+  total-market-cap history, so the market-cap trend is the 24h change of
+  those coins' combined cap at today's circulating supply
+- backfill writes the columnar history the worker serves from AGENT_KV at
+  /api/sentiment/history (key sentiment:history:v1)
+- evaluate compares weight sets on saved inputs: score spread, days per
+  label, and how often the label differs from the first weight set
+- vectors: random inputs with expected outputs for scripts/verify-sentiment.js
+
+Requires numpy.
+
+Usage:
+  python3 sentiment.py fetch    [--days 2000] -o inputs.npz
+  python3 sentiment.py backfill (--inputs inputs.npz | --days 2000) [--weights 0.4,0.35,0.25] -o history.json
+  npx wrangler kv key put sentiment:history:v1 --path history.json --binding AGENT_KV
+  python3 sentiment.py evaluate inputs.npz 0.4,0.35,0.25 0.5,0.3,0.2 [...]
+  python3 sentiment.py bench    [--days 3650] [--coins 10]
+  python3 sentiment.py vectors  [--n 2000] [--seed 1] > vectors.json
+"""
+import argparse, json, math, os, random, re, sys, time, urllib.request
+import numpy as np
+import worker_template
+
+WEIGHTS = dict(worker_template.SENTIMENT_WEIGHTS)
+HISTORY_KEY = "sentiment:history:v1"
+DAY = 86400
+
+# sentimentLabel: (lower bound, label), highest first
+LABELS = [(75, "Extreme Greed"), (60, "Greed"), (45, "Neutral"), (25, "Fear"), (0, "Extreme Fear")]
+
+FNG_URL = "https://api.alternative.me/fng/?limit=0&format=json"
+LLAMA_CHART_URL = "https://coins.llama.fi/chart/{ids}?start={start}&span={span}&period=1d"
+LLAMA_CURRENT_URL = "https://coins.llama.fi/prices/current/{ids}"
+CHART_SPAN = 365  # days per DeFiLlama chart request
+
+
+def parse_weights(text):
+    """"0.4,0.35,0.25" -> weights dict, validated the same way as the worker parameter."""
+    vals = [float(x) for x in text.split(",")]
+    if len(vals) != 3:
+        raise ValueError(f"expected 3 weights (fear_greed,momentum,market), got {text!r}")
+    w = dict(zip(("fear_greed", "momentum", "market"), vals))
+    worker_template.sentiment_params(w)
+    return w
+
+
+def js_round(x):
+    """Math.round: nearest integer, halves towards +infinity."""
+    r = np.floor(x)
+    return r + (x - r >= 0.5)
+
+
+def label(score):
+    return next(name for lo, name in LABELS if score >= lo)
+
+
+def llama_coins(path=worker_template.TEMPLATE_PATH):
+    """The worker's LLAMA_COINS ({"coingecko:bitcoin": "BTC", ...}), read from the template."""
+    with open(path) as f:
+        m = re.search(r"^const LLAMA_COINS = (\{.*\});$", f.read(), re.M)
+    if not m:
+        raise ValueError("LLAMA_COINS not found in worker.template.js")
+    return json.loads(m.group(1))
+
+
+# ─── Engine ───────────────────────────────────────
+def score(fear_greed, changes, market_change, weights=WEIGHTS):
+    """Scores for D days.
+
+    fear_greed (D,) index value, NaN = unavailable
+    changes (D, C) per-coin 24h % change, NaN = coin absent that day
+    market_change (D,) market-cap 24h % change, NaN = unavailable
+    Returns dict of (D,) float arrays: score, momentum, market, avg_change
+    (NaN where the worker's value is null)."""
+    fear_greed = np.asarray(fear_greed, dtype=np.float64)
+    changes = np.asarray(changes, dtype=np.float64).reshape(len(fear_greed), -1)
+    market_change = np.asarray(market_change, dtype=np.float64)
+
+    present = ~np.isnan(changes)
+    n = present.sum(axis=1)
+    # changes.reduce((s,c)=>s+c, 0): left to right per day, vectorized across days
+    total = np.zeros(len(fear_greed))
+    for c in range(changes.shape[1]):
+        total += np.where(present[:, c], changes[:, c], 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg = np.where(n > 0, total / n, np.nan)
+        pos = (present & (changes > 0)).sum(axis=1) / n
+    momentum = np.where(n > 0, np.clip(50 + avg * 4 + (pos - 0.5) * 40, 0, 100), np.nan)
+
+    # if (mcapChange): null, NaN and 0 all leave the trend neutral
+    has_market = ~np.isnan(market_change) & (market_change != 0)
+    market = np.where(has_market, np.clip(50 + np.where(has_market, market_change, 0) * 5, 0, 100), np.nan)
+
+    s = np.where(np.isnan(fear_greed), 50.0, fear_greed) * weights["fear_greed"]
+    s += np.where(np.isnan(momentum), 50.0, momentum) * weights["momentum"]
+    s += np.where(np.isnan(market), 50.0, market) * weights["market"]
+    return {"score": js_round(np.clip(s, 0, 100)), "momentum": momentum, "market": market, "avg_change": avg}
+
+
+# ─── Historical inputs ────────────────────────────
+def get_json(url):
+    req = urllib.request.Request(url, headers={"User-Agent": "realmagents-sentiment"})
+    with urllib.request.urlopen(req, timeout=30) as r:
+        return json.load(r)
+
+
+def fetch_inputs(days, coins=None):
+    """Daily inputs for the last `days` UTC days (today excluded; the worker serves it live).
+    Returns dict: day (D,) int days since epoch, fear_greed (D,), changes (D, C), market_change (D,), coins."""
+    coins = coins or llama_coins()
+    ids = list(coins)
+    end = int(time.time()) // DAY
+    day = np.arange(end - days, end)
+    index = {d: i for i, d in enumerate(day.tolist())}
+
+    fear_greed = np.full(days, np.nan)
+    for x in get_json(FNG_URL)["data"]:
+        i = index.get(int(x["timestamp"]) // DAY)
+        if i is not None:
+            fear_greed[i] = int(x["value"])
+
+    # One close per coin per day, plus the day before the range for the first change
+    close = np.full((days + 1, len(ids)), np.nan)
+    start = (end - days - 1) * DAY
+    for off in range(0, days + 1, CHART_SPAN):
+        span = min(CHART_SPAN, days + 1 - off)
+        url = LLAMA_CHART_URL.format(ids=",".join(ids), start=start + off * DAY, span=span)
+        for cid, c in get_json(url).get("coins", {}).items():
+            j = ids.index(cid)
+            for pt in c.get("prices", []):
+                i = int(pt["timestamp"]) // DAY - (end - days - 1)
+                if 0 <= i <= days:
+                    close[i, j] = pt["price"]
+    current = get_json(LLAMA_CURRENT_URL.format(ids=",".join(ids))).get("coins", {})
+    supply = np.array([(current.get(k, {}).get("mcap") or np.nan) / (current.get(k, {}).get("price") or np.nan)
+                       for k in ids])
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # change24h: Math.round(ch*100)/100, as fetchLlamaCoins reports it
+        changes = js_round((close[1:] / close[:-1] - 1) * 100 * 100) / 100
+        both = ~np.isnan(close[1:]) & ~np.isnan(close[:-1]) & ~np.isnan(supply)
+        cap_now = np.where(both, close[1:] * supply, 0).sum(axis=1)
+        cap_prev = np.where(both, close[:-1] * supply, 0).sum(axis=1)
+        market_change = np.where(cap_prev > 0, js_round((cap_now / cap_prev - 1) * 100 * 100) / 100, np.nan)
+    return {"day": day, "fear_greed": fear_greed, "changes": changes, "market_change": market_change,
+            "coins": np.array([coins[k] for k in ids])}
+
+
+def load_inputs(path):
+    with np.load(path) as z:
+        return {k: z[k] for k in z.files}
+
+
+def history(inputs, weights=WEIGHTS):
+    """The columnar payload the worker stores under HISTORY_KEY."""
+    out = score(inputs["fear_greed"], inputs["changes"], inputs["market_change"], weights)
+    col = lambda a: [None if math.isnan(v) else int(v) for v in js_round(a).tolist()]
+    return {
+        "weights": {"fearGreed": weights["fear_greed"], "momentum": weights["momentum"], "market": weights["market"]},
+        "start": int(inputs["day"][0]) * DAY, "step": DAY,
+        "score": col(out["score"]), "fearGreed": col(inputs["fear_greed"]),
+        "momentum": col(out["momentum"]), "market": col(out["market"]),
+    }
+
+
+# ─── Parity vectors ───────────────────────────────
+def vectors(n=2000, seed=1):
+    """Random and edge-case inputs with expected outputs, for scripts/verify-sentiment.js."""
+    rng = random.Random(seed)
+    cases = [
+        (None, [], None), (50, [0, 0], 0), (0, [-100] * 10, -100), (100, [100] * 10, 100),
+        (62, [1.25, -0.5, 3.1], 0.01), (None, [0.1], None), (25, [-2.5, 2.5], -0.02),
+    ]
+    pick = lambda: rng.choice([round(rng.uniform(-15, 15), 2), round(rng.gauss(0, 3), 2), 0.0, rng.uniform(-40, 40)])
+    while len(cases) < n:
+        fg = rng.choice([None, rng.randint(0, 100)])
+        chg = [pick() for _ in range(rng.choice([0, 1, 3, 10, 10, 10]))]
+        cases.append((fg, chg, rng.choice([None, 0.0, pick()])))
+
+    width = max(len(c[1]) for c in cases)
+    changes = np.full((len(cases), width), np.nan)
+    for i, (_, chg, _) in enumerate(cases):
+        changes[i, :len(chg)] = chg
+    fg = np.array([np.nan if c[0] is None else c[0] for c in cases], dtype=np.float64)
+    mkt = np.array([np.nan if c[2] is None else c[2] for c in cases], dtype=np.float64)
+    out = score(fg, changes, mkt)
+    null = lambda v: None if math.isnan(v) else v
+    return {"seed": seed, "weights": worker_template.sentiment_params(WEIGHTS)["SENTIMENT_WEIGHTS"], "vectors": [
+        {"fg": c[0], "changes": c[1], "mcap": c[2], "score": int(out["score"][i]),
+         "momentum": null(out["momentum"][i]), "market": null(out["market"][i]), "avgChange": null(out["avg_change"][i])}
+        for i, c in enumerate(cases)]}
+
+
+def summarize(scores):
+    counts = {name: 0 for _, name in LABELS}
+    for s in scores.tolist():
+        counts[label(s)] += 1
+    return counts
+
+
+def main(argv):
+    ap = argparse.ArgumentParser(description="Sentiment score backfill and weight evaluation")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("fetch"); p.add_argument("--days", type=int, default=2000); p.add_argument("-o", "--out", required=True)
+    p = sub.add_parser("backfill"); p.add_argument("--inputs"); p.add_argument("--days", type=int, default=2000)
+    p.add_argument("--weights", type=parse_weights, default=WEIGHTS); p.add_argument("-o", "--out", required=True)
+    p = sub.add_parser("evaluate"); p.add_argument("inputs"); p.add_argument("weights", type=parse_weights, nargs="+")
+    p = sub.add_parser("bench"); p.add_argument("--days", type=int, default=3650); p.add_argument("--coins", type=int, default=10)
+    p = sub.add_parser("vectors"); p.add_argument("--n", type=int, default=2000); p.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "vectors":
+        json.dump(vectors(args.n, args.seed), sys.stdout)
+        return 0
+
+    if args.cmd == "bench":
+        rng = np.random.default_rng(1)
+        fg = rng.integers(0, 101, args.days).astype(np.float64)
+        changes = np.round(rng.normal(0, 3, (args.days, args.coins)), 2)
+        changes[rng.random(changes.shape) < 0.05] = np.nan
+        mkt = np.round(rng.normal(0, 2, args.days), 2)
+        score(fg, changes, mkt)
+        t0 = time.perf_counter()
+        for _ in range(20):
+            score(fg, changes, mkt)
+        ms = (time.perf_counter() - t0) / 20 * 1000
+        print(f"[OK] {args.days} days x {args.coins} coins: {ms:.2f} ms per backfill")
+        return 0
+
+    if args.cmd == "fetch" or (args.cmd == "backfill" and not args.inputs):
+        t0 = time.perf_counter()
+        try:
+            inputs = fetch_inputs(args.days)
+        except OSError as e:
+            print(f"[ERROR] Fetching history failed: {e}")
+            return 1
+        have = int((~np.isnan(inputs["fear_greed"])).sum())
+        print(f"[OK] Fetched {args.days} days ({have} with Fear & Greed, {len(inputs['coins'])} coins) "
+              f"in {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+        if args.cmd == "fetch":
+            np.savez_compressed(args.out, **inputs)
+            print(f"[OK] Wrote {args.out}")
+            return 0
+    elif args.cmd in ("backfill", "evaluate"):
+        path = args.inputs
+        if not os.path.exists(path):
+            print(f"[ERROR] {path} not found (create it with: python3 sentiment.py fetch -o {path})")
+            return 1
+        inputs = load_inputs(path)
+
+    if args.cmd == "backfill":
+        t0 = time.perf_counter()
+        out = history(inputs, args.weights)
+        ms = (time.perf_counter() - t0) * 1000
+        with open(args.out, "w") as f:
+            json.dump(out, f, separators=(",", ":"))
+        first = time.strftime("%Y-%m-%d", time.gmtime(out["start"]))
+        print(f"[OK] {len(out['score'])} days from {first} scored in {ms:.1f} ms -> {args.out}")
+        print(f"[DONE] npx wrangler kv key put {HISTORY_KEY} --path {args.out} --binding AGENT_KV")
+        return 0
+
+    # evaluate: the first weight set is the baseline
+    results = [score(inputs["fear_greed"], inputs["changes"], inputs["market_change"], w)["score"] for w in args.weights]
+    print(f"{len(results[0])} days")
+    for w, s in zip(args.weights, results):
+        labels = np.array([label(v) for v in s.tolist()])
+        base = np.array([label(v) for v in results[0].tolist()])
+        counts = ", ".join(f"{k} {v}" for k, v in summarize(s).items())
+        print(f"{w['fear_greed']:.2f},{w['momentum']:.2f},{w['market']:.2f}  mean {s.mean():5.1f}  sd {s.std():4.1f}  "
+              f"label changes {int((labels != base).sum()):>5}  [{counts}]")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
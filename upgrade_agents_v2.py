@@ -3,18 +3,22 @@ RealmAgents v2.0 Upgrade Script
 1. Replaces worker.js with enhanced multi-source API
 2. Updates App.jsx Agents section with new data display
 """
-import os, shutil
+import os
+from backup_store import BackupStore
+
+ROOT = os.environ.get("REALMAGENTS_ROOT") or os.path.expanduser("~/realmagents")
+backups = BackupStore(ROOT)
 
 # ═══════════════════════════════════════════════════
 # 1. UPGRADE WORKER.JS
 # ═══════════════════════════════════════════════════
-WORKER_DIR = os.path.expanduser("~/realmagents/agents-api")
+WORKER_DIR = os.path.join(ROOT, "agents-api")
 WORKER_PATH = os.path.join(WORKER_DIR, "worker.js")
 
 # Backup
 if os.path.exists(WORKER_PATH):
-    shutil.copy2(WORKER_PATH, WORKER_PATH + ".v1.bak")
-    print(f"[OK] Backed up worker.js -> worker.js.v1.bak")
+    entry, _ = backups.backup(WORKER_PATH, "v1")
+    print(f"[OK] Backed up worker.js -> backup {entry['id']}")
 
 # Read new worker from stdin marker
 # (The new worker.js is written separately, we just need to copy it)
@@ -23,7 +27,7 @@ print("[INFO] Worker.js will be written by the next command")
 # ═══════════════════════════════════════════════════
 # 2. UPDATE App.jsx AGENTS SECTION
 # ═══════════════════════════════════════════════════
-APP_PATH = os.path.expanduser("~/realmagents/frontend/src/App.jsx")
+APP_PATH = os.path.join(ROOT, "frontend", "src", "App.jsx")
 
 if not os.path.exists(APP_PATH):
     print(f"[ERROR] App.jsx not found at {APP_PATH}")
@@ -33,8 +37,8 @@ with open(APP_PATH) as f:
     content = f.read()
 
 # Backup
-shutil.copy2(APP_PATH, APP_PATH + ".pre-v2")
-print(f"[OK] Backed up App.jsx -> App.jsx.pre-v2")
+entry, _ = backups.backup(APP_PATH, "pre-v2")
+print(f"[OK] Backed up App.jsx -> backup {entry['id']}")
 
 # Replace the entire Agents function with enhanced version
 OLD_AGENTS_START = "// ─── Agents Section"
@@ -58,11 +62,9 @@ function Agents() {
   const load = async () => {
     setLoading(true);
     try {
-      const [y, s, w] = await Promise.all([
-        fetch(`${API}/api/agents/0/data`).then(r => r.json()),
-        fetch(`${API}/api/agents/1/data`).then(r => r.json()),
-        fetch(`${API}/api/agents/2/data`).then(r => r.json()),
-      ]);
+      // One request for the three agents shown here, projected to the fields rendered
+      const d = await fetch(`${API}/api/dashboard?ids=0,1,2&fields=summary,opportunities,topCoins,fearGreed,sentimentSources,transfers,smartMoney,error`).then(r => r.json());
+      const [y, s, w] = d.agents;
       setYield(y); setSentiment(s); setWhale(w);
       setLastUpdate(new Date().toLocaleTimeString());
     } catch (e) { console.error("Agent data failed:", e); }
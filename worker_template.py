@@ -0,0 +1,352 @@
+"""
+Worker code generation from agents-api/worker.template.js
+- The template is plain JS with __NAME__ placeholders (it passes node --check)
+- Compiled once into fragments, one per "// ─── Section" / "// AGENT n" block;
+  each fragment knows which parameters it uses
+- Rendered fragments are cached by their parameter values, so a variant only
+  re-renders the sections whose parameters differ from one already built
+- Whale tracker settings (per-asset thresholds, window in seconds, chain)
+  are one config; block range and alert text are derived from it
+- Sentiment weights are a parameter shared with sentiment.py, so weights
+  evaluated offline deploy unchanged
+- Agent history: 1m / 1h / 1d rollup rings of each snapshot's summary fields
+- Launchpad indexer: candle resolutions as (seconds, buckets) rings; the
+  coarsest must span 24h since the dashboard's 24h stats are read from it
+- Generates per-tenant worker variants from a JSON file of overrides
+
+Usage:
+  python3 worker_template.py variants tenants.json -o build/tenants
+      tenants.json: {"tenant-a": {"VERSION": "2.1.1", "WHALE": {"window_s": 86400}}, ...}
+  python3 worker_template.py bench [N]
+"""
+import argparse, json, math, os, re, sys, time
+from decimal import Decimal
+import address_labels, launchpad
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_PATH = os.path.join(HERE, "agents-api", "worker.template.js")
+LABELS_CSV = os.path.join(HERE, "agents-api", "labels.csv")
+
+PLACEHOLDER_RE = re.compile(r"__([A-Z][A-Z0-9_]*)__")
+SECTION_RE = re.compile(r"^// (?:─── (.+?) ─*|═+\n// (.+)\n// ═+)$", re.M)
+FRAGMENT_CACHE_MAX = 64
+
+# Cron cadence per agent (ids into FETCHERS); matches AGENT_TTL in the worker
+SCHEDULE = {
+    "*/5 * * * *": [0],  # Yield Optimizer
+    "* * * * *": [1],    # Sentiment Analyzer
+    "*/2 * * * *": [2, 3],  # Whale Tracker, Launchpad Indexer
+}
+
+# Average block time per chain (seconds)
+BLOCK_TIME_S = {"base": 2, "optimism": 2, "arbitrum": 0.25, "ethereum": 12}
+
+# Whale tracker: window in seconds; one row per tracked token with its
+# threshold in whole tokens (decimal string). All tokens are scanned by a
+# single eth_getLogs call, so extra rows cost no extra RPC round trips, e.g.
+#   {"symbol": "USDC", "address": "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913",
+#    "decimals": 6, "threshold": "250000"}
+# address_env names a worker env var that overrides the address.
+WHALE = {
+    "chain": "base",
+    "window_s": 8 * 3600,
+    "assets": [
+        {"symbol": "REALM", "address": "0xBA2cA14375b2cECA4f04350Bd014B375Bc014ad2", "decimals": 18,
+         "threshold": "1000", "address_env": "REALM_TOKEN"},
+        {"symbol": "WETH", "address": "0x4200000000000000000000000000000000000006", "decimals": 18,
+         "threshold": "0.5"},
+    ],
+}
+ADDRESS_RE = re.compile(r"^0x[0-9a-fA-F]{40}$")
+
+# Sentiment score weights (Fear & Greed, momentum, market-cap trend); also the
+# defaults sentiment.py backfills and evaluates history with
+SENTIMENT_WEIGHTS = {"fear_greed": 0.4, "momentum": 0.35, "market": 0.25}
+
+# Agent history: summary rollup rings as [seconds per bucket, buckets kept],
+# finest first, each a multiple of the one before (1m for 6h, 1h for 30d, 1d
+# for a year); max_points caps one /api/agents/:id/history response
+SERIES = {
+    "resolutions": [[60, 360], [3600, 720], [86400, 365]],
+    "max_points": 500,
+}
+
+# Launchpad indexer: history loaded on a cold start, blocks scanned per run,
+# and candle rings as [seconds per candle, candles kept], finest first
+LAUNCHPAD = {
+    "chain": "base",
+    "address": launchpad.LAUNCHPAD_ADDRESS,
+    "backfill_s": 7 * 86400,
+    "scan_max_blocks": 50000,
+    "resolutions": [[300, 288], [3600, 168]],
+}
+
+
+def js_value(v):
+    """Strings are inserted verbatim (JS source); anything else as JSON."""
+    return v if isinstance(v, str) else json.dumps(v)
+
+
+def wei_expr(amount, decimals):
+    """Whole-token amount as a JS BigInt expression: "0.5", 18 -> 5n * (10n ** 17n)."""
+    whole, _, frac = str(Decimal(amount)).partition(".")
+    frac = frac.rstrip("0")
+    exp = decimals - len(frac)
+    if exp < 0:
+        raise ValueError(f"threshold {amount} has more than {decimals} decimals")
+    return f"{int(whole + frac)}n * (10n ** {exp}n)"
+
+
+def compact(amount):
+    """Short display form: 1000 -> 1K, 2500000 -> 2.5M, 0.5 -> 0.5."""
+    d = Decimal(amount)
+    for size, suffix in ((10 ** 9, "B"), (10 ** 6, "M"), (10 ** 3, "K")):
+        if d >= size:
+            return f"{d / size:f}".rstrip("0").rstrip(".") + suffix
+    return f"{d:f}".rstrip("0").rstrip(".") if "." in f"{d:f}" else f"{d:f}"
+
+
+def window_text(seconds):
+    """("8 hours", "8h") / ("1 hour", "1h") / ("30 minutes", "30m")."""
+    if seconds % 3600 == 0:
+        n, unit, short = seconds // 3600, "hour", "h"
+    else:
+        n, unit, short = math.ceil(seconds / 60), "minute", "m"
+    return f"{n} {unit}{'' if n == 1 else 's'}", f"{n}{short}"
+
+
+def whale_params(cfg=WHALE):
+    """Template parameters for a whale config; every number/text comes from cfg."""
+    if cfg["chain"] not in BLOCK_TIME_S:
+        raise ValueError(f"unknown chain {cfg['chain']!r} (known: {', '.join(BLOCK_TIME_S)})")
+    if cfg["window_s"] <= 0:
+        raise ValueError("whale window_s must be positive")
+    rows, seen = [], set()
+    for a in cfg["assets"]:
+        if not ADDRESS_RE.match(a["address"]):
+            raise ValueError(f"whale asset {a['symbol']}: bad address {a['address']!r}")
+        if a["symbol"] in seen or a["address"].lower() in seen:
+            raise ValueError(f"whale asset {a['symbol']} listed twice")
+        seen.update((a["symbol"], a["address"].lower()))
+        row = f'symbol:{json.dumps(a["symbol"])}, address:{json.dumps(a["address"])}, decimals:{int(a["decimals"])}, ' \
+              f'threshold:{wei_expr(a["threshold"], int(a["decimals"]))}'
+        if a.get("address_env"):
+            row += f', addressEnv:{json.dumps(a["address_env"])}'
+        rows.append("  { " + row + " },")
+    text, short = window_text(int(cfg["window_s"]))
+    return {
+        "WHALE_ASSETS": "[\n" + "\n".join(rows) + "\n]",
+        "SCAN_BLOCKS": math.ceil(cfg["window_s"] / BLOCK_TIME_S[cfg["chain"]]),
+        "WINDOW_TEXT": text,
+        "WINDOW_SHORT": short,
+        "ALERT_THRESHOLDS": " or ".join(f">{compact(a['threshold'])} {a['symbol']}" for a in cfg["assets"]),
+    }
+
+
+def sentiment_params(weights=SENTIMENT_WEIGHTS):
+    w = {k: float(weights[k]) for k in ("fear_greed", "momentum", "market")}
+    if any(v < 0 for v in w.values()) or abs(sum(w.values()) - 1) > 1e-9:
+        raise ValueError(f"sentiment weights must be non-negative and sum to 1, got {w}")
+    return {"SENTIMENT_WEIGHTS": {"fearGreed": w["fear_greed"], "momentum": w["momentum"], "market": w["market"]}}
+
+
+def series_params(cfg=SERIES):
+    res = [[int(r), int(n)] for r, n in cfg["resolutions"]]
+    if not res or any(r <= 0 or n <= 0 for r, n in res):
+        raise ValueError("series resolutions must be positive [seconds, buckets] pairs")
+    for (r0, n0), (r1, n1) in zip(res, res[1:]):
+        if r1 <= r0 or r1 % r0 or r1 * n1 <= r0 * n0:
+            raise ValueError("series resolutions must be finest first, each a multiple of the previous one "
+                             "and covering a longer window")
+    return {"SERIES": json.dumps({"resolutions": res, "maxPoints": int(cfg["max_points"])})}
+
+
+def launchpad_params(cfg=LAUNCHPAD):
+    """LAUNCHPAD as the worker's JS config object (topics and selectors from launchpad.py)."""
+    if not ADDRESS_RE.match(cfg["address"]):
+        raise ValueError(f"launchpad: bad address {cfg['address']!r}")
+    res = [[int(r), int(n)] for r, n in cfg["resolutions"]]
+    if not res or any(r <= 0 or n <= 0 for r, n in res):
+        raise ValueError("launchpad resolutions must be positive [seconds, buckets] pairs")
+    if res[-1][0] * res[-1][1] < 86400:
+        raise ValueError("launchpad: the coarsest resolution must cover at least 24h")
+    bt = BLOCK_TIME_S[cfg["chain"]]
+    return {"LAUNCHPAD": json.dumps({
+        "address": cfg["address"],
+        "topics": {"launched": launchpad.TOPICS["AgentLaunched"], "bought": launchpad.TOPICS["TokensBought"],
+                   "sold": launchpad.TOPICS["TokensSold"]},
+        "selectors": {k: launchpad.SELECTORS[k] for k in ("getLaunch", "tradeFee", "totalSupply")},
+        "resolutions": res,
+        "backfillBlocks": math.ceil(cfg["backfill_s"] / bt),
+        "scanMax": int(cfg["scan_max_blocks"]),
+        "blockTime": bt,
+    })}
+
+
+def load_whale_config(root):
+    """WHALE merged with the deployment's <root>/agents-api/whale.json, if present."""
+    path = os.path.join(root, "agents-api", "whale.json")
+    if not os.path.exists(path):
+        return dict(WHALE)
+    with open(path) as f:
+        return dict(WHALE, **json.load(f))
+
+
+def describe_whale(cfg):
+    p = whale_params(cfg)
+    return (f"window {p['WINDOW_TEXT']} ({p['SCAN_BLOCKS']} blocks @ {BLOCK_TIME_S[cfg['chain']]}s on {cfg['chain']}), "
+            f"thresholds {p['ALERT_THRESHOLDS']}")
+
+
+def line_patches(old_params, new_params, path=TEMPLATE_PATH):
+    """(old, new) text of every template line whose rendering differs between two parameter sets."""
+    def fill(line, params):
+        return PLACEHOLDER_RE.sub(lambda m: js_value(params[m.group(1)]), line)
+    changed = {k for k in set(old_params) | set(new_params) if old_params.get(k) != new_params.get(k)}
+    with open(path) as f:
+        lines = [l for l in f.read().splitlines() if changed & set(PLACEHOLDER_RE.findall(l))]
+    out = []
+    for line in lines:
+        old, new = fill(line, old_params), fill(line, new_params)
+        if old != new and (old, new) not in out:
+            out.append((old, new))
+    return out
+
+
+def with_overrides(params, overrides):
+    """params with template overrides applied; a "WHALE" key is merged into the whale
+    config, "SENTIMENT_WEIGHTS" may use the Python names (fear_greed, momentum, market)."""
+    overrides = dict(overrides)
+    whale = overrides.pop("WHALE", None)
+    weights = overrides.pop("SENTIMENT_WEIGHTS", None)
+    out = dict(params, **overrides)
+    if whale:
+        out.update(whale_params(dict(WHALE, **whale)))
+    if weights:
+        out.update(sentiment_params(dict(SENTIMENT_WEIGHTS, **weights)))
+    return out
+
+
+DEFAULTS = {
+    "VERSION": "2.1.0",
+    **whale_params(WHALE),
+    **launchpad_params(LAUNCHPAD),
+    **sentiment_params(SENTIMENT_WEIGHTS),
+    **series_params(SERIES),
+    "AGENT_TTL": [300, 60, 120, 120],
+    "SCHEDULE": SCHEDULE,
+}
+
+
+def default_params():
+    """DEFAULTS plus the built-in labels from agents-api/labels.csv."""
+    known = address_labels.load_labels(LABELS_CSV)
+    return dict(DEFAULTS, KNOWN_LABELS=address_labels.to_js_object(known))
+
+
+class Fragment:
+    def __init__(self, name, source):
+        self.name = name
+        # Even indices are literal text, odd indices are parameter names
+        self.parts = PLACEHOLDER_RE.split(source)
+        self.params = tuple(sorted(set(self.parts[1::2])))
+        self.cache = {}
+
+    def render(self, values):
+        key = tuple(values[p] for p in self.params)
+        out = self.cache.get(key)
+        if out is None:
+            parts = self.parts[:]
+            for i in range(1, len(parts), 2):
+                parts[i] = values[parts[i]]
+            out = "".join(parts)
+            if len(self.cache) >= FRAGMENT_CACHE_MAX:
+                self.cache.clear()
+            self.cache[key] = out
+        return out
+
+
+class WorkerTemplate:
+    def __init__(self, source):
+        cuts = [0] + [m.start() for m in SECTION_RE.finditer(source)] + [len(source)]
+        self.fragments = []
+        for a, b in zip(cuts, cuts[1:]):
+            if b > a:
+                m = SECTION_RE.match(source, a)
+                name = (m.group(1) or m.group(2)).strip() if m else "header"
+                self.fragments.append(Fragment(name, source[a:b]))
+        self.params = set(p for f in self.fragments for p in f.params)
+
+    def render(self, params):
+        missing = self.params - set(params)
+        if missing:
+            raise KeyError(f"missing template parameters: {', '.join(sorted(missing))}")
+        unknown = set(params) - self.params
+        if unknown:
+            raise ValueError(f"unknown template parameters: {', '.join(sorted(unknown))}")
+        values = {k: js_value(v) for k, v in params.items()}
+        return "".join(f.render(values) for f in self.fragments)
+
+
+_TEMPLATES = {}
+
+
+def load(path=TEMPLATE_PATH):
+    """Compiled template for path, reused until the file changes."""
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    if key not in _TEMPLATES:
+        with open(path) as f:
+            _TEMPLATES[key] = WorkerTemplate(f.read())
+    return _TEMPLATES[key]
+
+
+def render(params, path=TEMPLATE_PATH):
+    return load(path).render(params)
+
+
+def main(argv):
+    ap = argparse.ArgumentParser(description="Render worker.js variants from the template")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("variants"); p.add_argument("tenants"); p.add_argument("-o", "--out", required=True)
+    p = sub.add_parser("bench"); p.add_argument("n", nargs="?", type=int, default=50)
+    args = ap.parse_args(argv)
+
+    base = default_params()
+    t0 = time.perf_counter()
+    tpl = load()
+    compile_ms = (time.perf_counter() - t0) * 1000
+
+    if args.cmd == "variants":
+        from artifacts import Manifest
+        with open(args.tenants) as f:
+            tenants = json.load(f)
+        t0 = time.perf_counter()
+        out = {name: tpl.render(with_overrides(base, over)) for name, over in tenants.items()}
+        render_ms = (time.perf_counter() - t0) * 1000
+        manifest = Manifest(args.out)
+        written = 0
+        for name, src in out.items():
+            os.makedirs(os.path.join(args.out, name), exist_ok=True)
+            written += manifest.write(os.path.join(args.out, name, "worker.js"), src)
+        manifest.save()
+        print(f"[OK] Rendered {len(out)} variants in {render_ms:.1f} ms (template compile {compile_ms:.1f} ms)")
+        print(f"[OK] Wrote {written} changed worker.js files under {args.out}")
+    else:
+        variants = [with_overrides(base, {"VERSION": f"2.1.{i}", "WHALE": {"window_s": (8 + i % 4) * 3600}})
+                    for i in range(args.n)]
+        t0 = time.perf_counter()
+        for v in variants:
+            tpl.render(v)
+        cold = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        for v in variants:
+            tpl.render(v)
+        warm = (time.perf_counter() - t0) * 1000
+        print(f"template: {len(tpl.fragments)} fragments, {len(tpl.params)} parameters, compiled in {compile_ms:.2f} ms")
+        print(f"{args.n} variants: {cold:.2f} ms first pass, {warm:.2f} ms cached")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))